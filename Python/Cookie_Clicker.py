@@ -1,278 +1,390 @@
-from tkinter import *
-from tkinter import ttk
-
-root = Tk()
-root.geometry("500x500")
-root.title("Cookie Clicker")
-
-# Cookie NB display
-Cookies = IntVar(value=0)
-
-def updateCookieAmount(*args):
-	CookieNBLabel.config(text=f"Your cookies: {Cookies.get()}")
-	updateUpgradeButtons()
-
-Cookies.trace_add("write", updateCookieAmount)
-
-CookieNBLabel = Label(root, text=f"Your cookies: {Cookies.get()}", font=("Impact", 24))
-CookieNBLabel.pack(fill=X, pady=10)
-
-# Passive cookies display
-PassiveCookieAmount = IntVar(value=0)
-
-def updatePassiveCookieAmount(*args):
-	PassiveCookieLabel.config(text=f"Passive cookies/second: {PassiveCookieAmount.get()}")
-
-PassiveCookieAmount.trace_add("write", updatePassiveCookieAmount)
-
-PassiveCookieLabel = Label(root, text=f"Passive cookies/second: {PassiveCookieAmount.get()}")
-PassiveCookieLabel.pack(fill=X, pady=0)
-
-def passiveCookieTick():
-	passiveAmount = PassiveCookieAmount.get()
-	if passiveAmount > 0:
-		Cookies.set(Cookies.get() + passiveAmount)
-	root.after(1000, passiveCookieTick)
-passiveCookieTick()
-
-# Get Cookie button
-AddCookieAmount = IntVar(value=1)
-
-## Cookies per click display
-def updateAddCookieAmount(*args):
-	AddCookieLabel.config(text=f"Cookies/click: {AddCookieAmount.get()}")
-
-AddCookieAmount.trace_add("write", updateAddCookieAmount)
-
-AddCookieLabel = Label(root, text=f"Cookies/click: {AddCookieAmount.get()}")
-AddCookieLabel.pack(fill=X, pady=0)
-
-def updateAddCookieButton(*args):
-	c = AddCookieAmount.get()
-	s = f"Get {c} cookie"
-	if c > 1:
-		s += "s"
-	AddCookieButton.config(text=s)
-
-AddCookieAmount.trace_add("write", updateAddCookieButton)
-
-def addCookieButtonCmd():
-	Cookies.set(Cookies.get() + AddCookieAmount.get())
-
-AddCookieButton = Button(root, text=f"Get {AddCookieAmount.get()} cookie", command=addCookieButtonCmd)
-AddCookieButton.pack(fill=X, pady=5)
-
-# Upgrades Shop
-style = ttk.Style()
-style.theme_use("default")
-style.configure(
-	"Cookie.Horizontal.TProgressbar",
-	throughcolor="#f2f2f2",
-	background="#68ff54",
-	thickness=4
-)
-class UpgradeWidget:
-	def __init__(self, parent, upgrade_data, index):
-		self.data = upgrade_data
-		self.index = index
-
-		self.frame = Frame(parent)
-		self.frame.pack(fill=X, pady=4)
-
-		self.button = Button(
-			self.frame,
-			text=f"{self.data['name']} ({self.data['cost']})",
-			command=self.buy,
-			state=DISABLED
-		)
-		self.button.pack(fill=X)
-
-		self.description_label = Label(
-			self.frame,
-			text=self.data['description'],
-			font=("Arial", 9),
-			fg="gray"
-		)
-		self.description_label.pack(fill=X)
-
-		self.progress = ttk.Progressbar(
-			self.frame,
-			length=100,
-			mode="determinate",
-			style="Cookie.Horizontal.TProgressbar"
-		)
-		self.progress.pack(fill=X, pady=2)
-
-	def buy(self):
-		if self.data['bought']:
-			return
-		cost = self.data['cost']
-		if Cookies.get() >= cost:
-			Cookies.set(Cookies.get() - cost)
-			self.data['action']()
-			self.data['bought'] = True
-			refreshUpgradeList()
-	
-	def update(self):
-		if self.data['bought']:
-			self.button.config(
-				state=DISABLED,
-				text=f"{self.data['name']} (Bought)"
-			)
-			self.progress.forget()
-			self.description_label.forget()
-			return
-		cost = self.data['cost']
-		cookies = Cookies.get()
-		can_afford = cookies >= cost
-		self.button.config(state=NORMAL if can_afford else DISABLED)
-		progress = min(100, int((cookies / cost) * 100))
-		self.progress['value'] = progress
-
-UpgradeFrameContainer = LabelFrame(root, text="Upgrades")
-UpgradeFrameContainer.pack(fill=BOTH, expand=True, padx=10, pady=10)
-
-UpgradeCanvas = Canvas(UpgradeFrameContainer)
-UpgradeCanvas.pack(side=LEFT, fill=BOTH, expand=True)
-
-UpgradeScrollBar = Scrollbar(UpgradeFrameContainer, orient=VERTICAL, command=UpgradeCanvas.yview)
-UpgradeScrollBar.pack(side=RIGHT, fill=Y)
-
-UpgradeCanvas.configure(yscrollcommand=UpgradeScrollBar.set)
-
-UpgradeFrame = Frame(UpgradeCanvas)
-UpgradeFrameWindow = UpgradeCanvas.create_window((0, 0), window=UpgradeFrame, anchor="nw")
-
-def OnFrameConfigure(event):
-	UpgradeCanvas.configure(scrollregion=UpgradeCanvas.bbox("all"))
-
-UpgradeFrame.bind("<Configure>", OnFrameConfigure)
-
-def OnMouseWheel(event):
-	UpgradeCanvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-
-UpgradeCanvas.bind_all("<MouseWheel>", OnMouseWheel)
-
-UpgradeCanvas.bind("<Configure>", lambda e: UpgradeCanvas.itemconfig(UpgradeFrameWindow, width=e.width - UpgradeScrollBar.winfo_width()))
-
-Upgrades = [
-	{
-		"name": "Buy One, Get One Free!",
-		"cost": 10,
-		"description": "+1 cookie/click.",
-		"action": lambda: AddCookieAmount.set(AddCookieAmount.get() + 1),
-		"bought": False
-	},
-	{
-		"name": "PCI (Passive Cookie Income)",
-		"cost": 25,
-		"description": "+1 cookie/second.",
-		"action": lambda: PassiveCookieAmount.set(PassiveCookieAmount.get() + 1),
-		"bought": False
-	},
-	{
-		"name": "Unfair Trade",
-		"cost": 50,
-		"description": "+100 cookies.",
-		"action": lambda: Cookies.set(Cookies.get() + 100),
-		"bought": False
-	},
-	{
-		"name": "Heavy Handed",
-		"cost": 50,
-		"description": "+1 cookie/click.",
-		"action": lambda: AddCookieAmount.set(AddCookieAmount.get() + 1),
-		"bought": False
-	},
-	{
-		"name": "Rising Stocks",
-		"cost": 100,
-		"description": "+1 cookie/second.",
-		"action": lambda: PassiveCookieAmount.set(PassiveCookieAmount.get() + 1),
-		"bought": False
-	},
-	{
-		"name": "Extra Finger",
-		"cost": 150,
-		"description": "+1 cookie/click.",
-		"action": lambda: AddCookieAmount.set(AddCookieAmount.get() + 1),
-		"bought": False
-	},
-	{
-		"name": "Long Term Investment",
-		"cost": 200,
-		"description": "+2 cookies/second.",
-		"action": lambda: PassiveCookieAmount.set(PassiveCookieAmount.get() + 2),
-		"bought": False
-	},
-	{
-		"name": "Extra Hand",
-		"cost": 200,
-		"description": "+3 cookies/click.",
-		"action": lambda: AddCookieAmount.set(AddCookieAmount.get() + 3),
-		"bought": False
-	}
-]
-
-UpgradeWidgets = []
-BoughtFrameVisible = BooleanVar(value=False)
-
-def refreshUpgradeList():
-	global AvailableFrame, BoughtUpgradeFrame, BoughtToggleButton
-
-	for widget in UpgradeWidgets:
-		widget.frame.destroy()
-	UpgradeWidgets.clear()
-
-	for child in UpgradeFrame.winfo_children():
-		child.destroy()
-
-	AvailableLabel = Label(UpgradeFrame, text="Available Upgrades", font=("Arial", 10, "bold"))
-	AvailableLabel.pack(fill=X, pady=(5, 0))
-
-	AvailableFrame = Frame(UpgradeFrame)
-	AvailableFrame.pack(fill=X)
-
-	BoughtFrame = Frame(UpgradeFrame)
-	BoughtFrame.pack(fill=X, pady=(10, 0))
-
-	BoughtCount = sum(1 for u in Upgrades if u['bought'])
-
-	def ToggleBoughtSection():
-		if BoughtFrameVisible.get():
-			BoughtUpgradeFrame.pack_forget()
-			BoughtToggleButton.config(text=f"Show Bought Upgrades ({BoughtCount})")
-			BoughtFrameVisible.set(False)
-		else:
-			BoughtUpgradeFrame.pack(fill=X)
-			BoughtToggleButton.config(text=f"Hide Bought Upgrades ({BoughtCount})")
-			BoughtFrameVisible.set(True)
-		
-	BoughtToggleButton = Button(BoughtFrame, text=f"Show Bought Upgrades ({BoughtCount})", command=ToggleBoughtSection)
-	BoughtToggleButton.pack(fill=X)
-
-	if BoughtCount > 0:
-		BoughtLabel = Label(BoughtFrame, text="Bought Upgrades", font=("Arial", 10, "bold"))
-		BoughtLabel.pack(fill=X, pady=(5, 0))
-
-	BoughtUpgradeFrame = Frame(BoughtFrame)
-
-	sorted_upgrades = sorted(Upgrades, key=lambda u: u['cost'])
-
-	for i, upgrade in enumerate(sorted_upgrades):
-		target_frame = BoughtUpgradeFrame if upgrade['bought'] else AvailableFrame
-		widget = UpgradeWidget(target_frame, upgrade, i)
-		UpgradeWidgets.append(widget)
-
-	if BoughtFrameVisible.get():
-		BoughtUpgradeFrame.pack(fill=X)
-
-	updateUpgradeButtons()
-
-def updateUpgradeButtons():
-	for widget in UpgradeWidgets:
-		widget.update()
-
-refreshUpgradeList()
-
+import os
+import time
+from bisect import bisect_left, bisect_right
+from tkinter import *
+from tkinter import ttk
+
+from cookie_engine import UPGRADES, formatNumber
+from cookie_storage import JournaledSave
+from tk_scheduler import Scheduler, set_text
+
+SAVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cookie_save.json")
+MAX_OFFLINE_SECONDS = 7 * 86400
+FRAME_MS = 16  # UI refresh: at most one per display frame (~60 Hz)
+
+# Game state: the engine owns the economy in plain Python ints (no size limit);
+# the labels only display it, with compact number formatting
+# Saved as snapshot + journal of events, written by a background thread (see cookie_storage)
+Save = JournaledSave(SAVE_PATH)
+Engine = Save.load()
+OfflineSeconds, OfflineCookies = Engine.applyOffline(maxSeconds=MAX_OFFLINE_SECONDS)
+Save.start(Engine)
+Save.tick(OfflineSeconds)
+
+root = Tk()
+root.geometry("500x500")
+root.title("Cookie Clicker")
+
+# All the timers (passive tick, UI flush) share one drift-free scheduler
+Ticks = Scheduler(root)
+
+# Cookie NB display
+CookieNBLabel = Label(root, text="", font=("Impact", 24))
+CookieNBLabel.pack(fill=X, pady=10)
+
+if OfflineCookies > 0:
+	OfflineLabel = Label(root, text=f"Welcome back! +{formatNumber(OfflineCookies)} cookies while you were away ({int(OfflineSeconds // 60)} min).", fg="gray")
+	OfflineLabel.pack(fill=X)
+
+# Passive cookies display
+PassiveCookieLabel = Label(root, text="")
+PassiveCookieLabel.pack(fill=X, pady=0)
+
+def syncLabels():
+	# Push the engine state to the labels (only the ones whose text changed)
+	set_text(CookieNBLabel, f"Your cookies: {formatNumber(Engine.cookies)}")
+	set_text(PassiveCookieLabel, f"Passive cookies/second: {formatNumber(Engine.perSecond)}")
+	set_text(AddCookieLabel, f"Cookies/click: {formatNumber(Engine.perClick)}")
+	c = Engine.perClick
+	s = f"Get {formatNumber(c)} cookie"
+	if c > 1:
+		s += "s"
+	set_text(AddCookieButton, s)
+
+# State changes only mark the UI dirty; a single flush per frame pushes them to the widgets
+FlushJob = None
+
+def invalidate():
+	global FlushJob
+	if FlushJob is None:
+		FlushJob = Ticks.once(FRAME_MS / 1000, flushUi)
+
+def flushUi():
+	global FlushJob
+	FlushJob = None
+	syncLabels()
+	updateUpgradeButtons()
+
+LastTick = time.monotonic()
+
+def passiveCookieTick(t=None):
+	# Advance by the real time elapsed, so a late or skipped timer loses nothing
+	global LastTick
+	now = time.monotonic()
+	if Engine.advance(now - LastTick):
+		invalidate()
+	Save.tick(now - LastTick)
+	Save.flush()
+	LastTick = now
+
+# Get Cookie button
+## Cookies per click display
+AddCookieLabel = Label(root, text="")
+AddCookieLabel.pack(fill=X, pady=0)
+
+def addCookieButtonCmd():
+	Engine.click()
+	Save.click()
+	invalidate()
+
+AddCookieButton = Button(root, text="", command=addCookieButtonCmd)
+AddCookieButton.pack(fill=X, pady=5)
+syncLabels()
+
+Ticks.every(1.0, passiveCookieTick)
+
+# Upgrades Shop
+style = ttk.Style()
+style.theme_use("default")
+style.configure(
+	"Cookie.Horizontal.TProgressbar",
+	throughcolor="#f2f2f2",
+	background="#68ff54",
+	thickness=4
+)
+
+# The shop list is virtualized: rows have a fixed height, and only the rows inside
+# the visible part of the canvas have a widget. Widgets are pooled and rebound to
+# another upgrade when the list scrolls or changes.
+ROW_HEIGHT = 72
+HEADER_HEIGHT = 28
+
+def costKey(upgrade):
+	return (upgrade['cost'], upgrade['id'])
+
+class ShopIndex:
+	# Available and bought upgrades, each kept sorted by cost. A purchase moves
+	# one entry from one list to the other instead of re-sorting everything.
+	# Since available is sorted by cost, the affordable upgrades are always a prefix
+	# of it: available[:affordable]. When the cookie count changes, only the entries
+	# between the old and new threshold change state.
+	def __init__(self, upgrades):
+		self.available = sorted((u for u in upgrades if not u['bought']), key=costKey)
+		self.availableKeys = [costKey(u) for u in self.available]
+		self.bought = sorted((u for u in upgrades if u['bought']), key=costKey)
+		self.boughtKeys = [costKey(u) for u in self.bought]
+		self.affordable = 0
+
+	def setCookies(self, cookies):
+		# Move the threshold; returns the (start, stop) range of available that flipped
+		old = self.affordable
+		new = bisect_right(self.availableKeys, (cookies, float("inf")))
+		self.affordable = new
+		return (old, new) if old <= new else (new, old)
+
+	def isAffordable(self, upgrade):
+		return not upgrade['bought'] and bisect_left(self.availableKeys, costKey(upgrade)) < self.affordable
+
+	def markBought(self, upgrade):
+		key = costKey(upgrade)
+		i = bisect_left(self.availableKeys, key)
+		del self.availableKeys[i]
+		del self.available[i]
+		if i < self.affordable:
+			self.affordable -= 1
+		i = bisect_left(self.boughtKeys, key)
+		self.boughtKeys.insert(i, key)
+		self.bought.insert(i, upgrade)
+		upgrade['bought'] = True
+
+class UpgradeWidget:
+	def __init__(self, parent):
+		self.data = None
+
+		self.frame = Frame(parent)
+
+		self.button = Button(
+			self.frame,
+			text="",
+			command=self.buy,
+			state=DISABLED
+		)
+		self.button.pack(fill=X)
+
+		self.description_label = Label(
+			self.frame,
+			text="",
+			font=("Arial", 9),
+			fg="gray"
+		)
+		self.description_label.pack(fill=X)
+
+		self.progress = ttk.Progressbar(
+			self.frame,
+			length=100,
+			mode="determinate",
+			style="Cookie.Horizontal.TProgressbar"
+		)
+		self.progress.pack(fill=X, pady=2)
+		self.shown = None  # affordable state last pushed to Tk ("bought" for a bought upgrade)
+		self.shownProgress = None
+		self.compact = False  # description and progress bar hidden (bought layout)
+
+		self.window = parent.create_window(0, 0, window=self.frame, anchor="nw", height=ROW_HEIGHT - 8, state="hidden")
+		self.y = None
+
+	def bind(self, upgrade_data):
+		# Show another upgrade in this (pooled) row
+		if upgrade_data is self.data:
+			return
+		if self.data is not None:
+			RowWidgets.pop(self.data['id'], None)
+		RowWidgets[upgrade_data['id']] = self
+		self.data = upgrade_data
+		self.shown = None
+		self.shownProgress = None
+		self.description_label.config(text=upgrade_data['description'])
+		if upgrade_data['bought']:
+			self.button.config(text=f"{upgrade_data['name']} (Bought)")
+		else:
+			self.button.config(text=f"{upgrade_data['name']} ({formatNumber(upgrade_data['cost'])})")
+			if self.compact:
+				self.description_label.pack(fill=X)
+				self.progress.pack(fill=X, pady=2)
+				self.compact = False
+
+	def place(self, y):
+		if y != self.y:
+			UpgradeCanvas.coords(self.window, 0, y)
+			if self.y is None:
+				UpgradeCanvas.itemconfig(self.window, state="normal")
+			self.y = y
+
+	def hide(self):
+		if self.y is not None:
+			UpgradeCanvas.itemconfig(self.window, state="hidden")
+			self.y = None
+		if self.data is not None:
+			RowWidgets.pop(self.data['id'], None)
+		self.data = None
+		self.shown = None
+		self.shownProgress = None
+
+	def buy(self):
+		if self.data is None or self.data['bought']:
+			return
+		if Engine.buy(self.data['id']):
+			Save.buy(self.data['id'])
+			Save.flush()
+			Shop.markBought(self.data)
+			syncLabels()
+			refreshUpgradeList()
+
+	def update(self, can_afford):
+		# Only touch Tk when what is displayed actually changes
+		if self.data['bought']:
+			if self.shown != "bought":
+				self.button.config(
+					state=DISABLED,
+					text=f"{self.data['name']} (Bought)"
+				)
+				self.progress.forget()
+				self.description_label.forget()
+				self.compact = True
+				self.shown = "bought"
+			return
+		if can_afford != self.shown:
+			self.button.config(state=NORMAL if can_afford else DISABLED)
+			self.shown = can_afford
+		# integer math: exact for any size
+		progress = 100 if can_afford else min(100, Engine.cookies * 100 // self.data['cost'])
+		if progress != self.shownProgress:
+			self.progress['value'] = progress
+			self.shownProgress = progress
+
+UpgradeFrameContainer = LabelFrame(root, text="Upgrades")
+UpgradeFrameContainer.pack(fill=BOTH, expand=True, padx=10, pady=10)
+
+UpgradeCanvas = Canvas(UpgradeFrameContainer)
+UpgradeCanvas.pack(side=LEFT, fill=BOTH, expand=True)
+
+def onScroll(*args):
+	UpgradeCanvas.yview(*args)
+	refreshUpgradeList()
+
+UpgradeScrollBar = Scrollbar(UpgradeFrameContainer, orient=VERTICAL, command=onScroll)
+UpgradeScrollBar.pack(side=RIGHT, fill=Y)
+
+UpgradeCanvas.configure(yscrollcommand=UpgradeScrollBar.set, yscrollincrement=ROW_HEIGHT // 3)
+
+def OnMouseWheel(event):
+	UpgradeCanvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+	refreshUpgradeList()
+
+UpgradeCanvas.bind_all("<MouseWheel>", OnMouseWheel)
+
+CanvasWidth = 1
+
+def OnCanvasConfigure(event):
+	global CanvasWidth
+	CanvasWidth = max(1, event.width - UpgradeScrollBar.winfo_width())
+	for item in HeaderItems + [widget.window for widget in UpgradeWidgets]:
+		UpgradeCanvas.itemconfig(item, width=CanvasWidth)
+	refreshUpgradeList()
+
+UpgradeCanvas.bind("<Configure>", OnCanvasConfigure)
+
+# Shop entries: the engine catalogue plus the display state of each upgrade
+Upgrades = [dict(upgrade, id=i, bought=i in Engine.bought) for i, upgrade in enumerate(UPGRADES)]
+Shop = ShopIndex(Upgrades)
+
+UpgradeWidgets = []  # row pool
+RowWidgets = {}  # upgrade id -> widget showing it
+BoughtFrameVisible = BooleanVar(value=False)
+
+def ToggleBoughtSection():
+	BoughtFrameVisible.set(not BoughtFrameVisible.get())
+	refreshUpgradeList()
+
+AvailableLabel = Label(UpgradeCanvas, text="Available Upgrades", font=("Arial", 10, "bold"))
+BoughtToggleButton = Button(UpgradeCanvas, text="", command=ToggleBoughtSection)
+BoughtLabel = Label(UpgradeCanvas, text="Bought Upgrades", font=("Arial", 10, "bold"))
+AvailableItem = UpgradeCanvas.create_window(0, 0, window=AvailableLabel, anchor="nw", height=HEADER_HEIGHT)
+BoughtToggleItem = UpgradeCanvas.create_window(0, 0, window=BoughtToggleButton, anchor="nw", height=HEADER_HEIGHT)
+BoughtLabelItem = UpgradeCanvas.create_window(0, 0, window=BoughtLabel, anchor="nw", height=HEADER_HEIGHT, state="hidden")
+HeaderItems = [AvailableItem, BoughtToggleItem, BoughtLabelItem]
+ShopLayout = None
+
+def visibleRows(entries, top, start, bottom):
+	# (upgrade, y) for the entries of a section starting at y=start that intersect [top, bottom)
+	first = max(0, int((top - start) // ROW_HEIGHT))
+	last = min(len(entries), int((bottom - start) // ROW_HEIGHT) + 1)
+	return [(entries[i], start + i * ROW_HEIGHT) for i in range(first, last)]
+
+def refreshUpgradeList():
+	global ShopLayout
+	available = Shop.available
+	bought = Shop.bought
+	show_bought = BoughtFrameVisible.get()
+
+	# Section positions, computed from the row counts only
+	toggle_y = HEADER_HEIGHT + len(available) * ROW_HEIGHT + 10
+	bought_y = toggle_y + 2 * HEADER_HEIGHT
+	end = bought_y + (len(bought) * ROW_HEIGHT if show_bought else 0)
+	layout = (len(available), len(bought), show_bought)
+	if layout != ShopLayout:
+		ShopLayout = layout
+		UpgradeCanvas.configure(scrollregion=(0, 0, CanvasWidth, end))
+		UpgradeCanvas.coords(BoughtToggleItem, 0, toggle_y)
+		UpgradeCanvas.coords(BoughtLabelItem, 0, toggle_y + HEADER_HEIGHT)
+		UpgradeCanvas.itemconfig(BoughtLabelItem, state="normal" if bought else "hidden")
+		BoughtToggleButton.config(text=f"{'Hide' if show_bought else 'Show'} Bought Upgrades ({len(bought)})")
+	Shop.setCookies(Engine.cookies)
+
+	top = UpgradeCanvas.canvasy(0)
+	bottom = top + UpgradeCanvas.winfo_height()
+	rows = visibleRows(available, top, HEADER_HEIGHT, bottom)
+	if show_bought:
+		rows += visibleRows(bought, top, bought_y, bottom)
+
+	# Keep the widgets already showing a visible upgrade, rebind the others
+	wanted = {id(upgrade): (upgrade, y) for upgrade, y in rows}
+	free = []
+	for widget in UpgradeWidgets:
+		entry = wanted.pop(id(widget.data), None) if widget.data is not None else None
+		if entry is None:
+			free.append(widget)
+		else:
+			widget.place(entry[1])
+	for upgrade, y in wanted.values():
+		if free:
+			widget = free.pop()
+		else:
+			widget = UpgradeWidget(UpgradeCanvas)
+			UpgradeCanvas.itemconfig(widget.window, width=CanvasWidth)
+			UpgradeWidgets.append(widget)
+		widget.bind(upgrade)
+		widget.place(y)
+	for widget in free:
+		widget.hide()
+
+	for widget in UpgradeWidgets:
+		if widget.data is not None:
+			widget.update(Shop.isAffordable(widget.data))
+	set_text(AvailableLabel, f"Available Upgrades ({Shop.affordable} affordable)")
+
+def updateUpgradeButtons():
+	# Cookie count changed: the buttons to enable/disable are the upgrades between
+	# the old and new affordability threshold; the other affordable rows are left alone.
+	# Only the progress bars of the visible rows that are not affordable yet still move.
+	start, stop = Shop.setCookies(Engine.cookies)
+	if stop - start <= len(RowWidgets):
+		flipped = (RowWidgets.get(upgrade['id']) for upgrade in Shop.available[start:stop])
+	else:
+		flipped = list(RowWidgets.values())  # big jump (offline progress, fast-forward)
+	for widget in flipped:
+		if widget is not None:
+			widget.update(Shop.isAffordable(widget.data))
+	for widget in UpgradeWidgets:
+		if widget.data is not None and widget.shown is False:
+			widget.update(False)
+	set_text(AvailableLabel, f"Available Upgrades ({Shop.affordable} affordable)")
+
+refreshUpgradeList()
+
+def onClose():
+	Save.close()
+	root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", onClose)
 root.mainloop()
\ No newline at end of file
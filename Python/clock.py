@@ -1,17 +1,20 @@
-import tkinter as tk
-from datetime import datetime
-
-def update_clock():
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    label.config(text=now)
-    label.after(1000, update_clock)
-
-root = tk.Tk()
-root.title("Live Clock")
-
-label = tk.Label(root, font=("Helvetica", 48), bg="black", fg="lime")
-label.pack(fill="both", expand=True)
-
-update_clock()
-root.mainloop()
-
+import tkinter as tk
+from datetime import datetime
+
+from tk_scheduler import Scheduler, set_text
+
+def update_clock(t):
+    # t is the exact second boundary the tick was scheduled for, so each
+    # second is shown once, even if the timer fires a few ms late
+    set_text(label, datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S"))
+
+root = tk.Tk()
+root.title("Live Clock")
+
+label = tk.Label(root, font=("Helvetica", 48), bg="black", fg="lime")
+label.pack(fill="both", expand=True)
+
+ticks = Scheduler(root)
+set_text(label, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+ticks.every(1.0, update_clock)
+root.mainloop()
@@ -0,0 +1,172 @@
+import json
+import os
+import time
+
+# Cookie Clicker economy, without any Tk widget.
+# All the game state lives in a CookieEngine; the UI only reads it and calls
+# click() / buy(). Time is advanced explicitly with advance(seconds), in O(1)
+# whatever the duration, so offline progress and fast-forward are instant.
+
+# Upgrade catalogue, loaded from a JSON file: a list of
+#   {"name": ..., "cost": ..., "description": ..., "effect": [kind, amount]}
+# with kind one of
+#   "click"   -> +amount cookies/click
+#   "passive" -> +amount cookies/second
+#   "cookies" -> +amount cookies, once
+# Saves refer to upgrades by their position in the file: add new ones at the end.
+UPGRADES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cookie_upgrades.json")
+EFFECT_KINDS = ("click", "passive", "cookies")
+
+
+def loadUpgrades(path=UPGRADES_PATH):
+	"""Upgrade catalogue from a JSON file; raises ValueError on a malformed entry."""
+	with open(path, encoding="utf-8") as f:
+		entries = json.load(f)
+	upgrades = []
+	for i, entry in enumerate(entries):
+		try:
+			kind, amount = entry['effect']
+			upgrade = {
+				"name": entry['name'],
+				"cost": int(entry['cost']),
+				"description": entry.get('description', ""),
+				"effect": (kind, int(amount)),
+			}
+		except (KeyError, TypeError, ValueError) as e:
+			raise ValueError(f"{path}: upgrade {i} is malformed ({e!r})") from None
+		if kind not in EFFECT_KINDS:
+			raise ValueError(f"{path}: upgrade {i} ({upgrade['name']}) has an unknown effect: {kind}")
+		if upgrade['cost'] <= 0:
+			raise ValueError(f"{path}: upgrade {i} ({upgrade['name']}) must cost at least 1 cookie")
+		upgrades.append(upgrade)
+	return upgrades
+
+
+UPGRADES = loadUpgrades()
+
+SAVE_VERSION = 1
+
+# Short scale suffixes, then scientific notation
+SUFFIXES = ["", "K", "M", "B", "T", "Qa", "Qi", "Sx", "Sp", "Oc", "No", "Dc"]
+
+
+def formatNumber(n):
+	"""Compact display of a cookie amount: 999, 1.5K, 12.3M, 456B, ..., 1.23e45."""
+	n = int(n)
+	if n < 0:
+		return "-" + formatNumber(-n)
+	if n < 1000:
+		return str(n)
+	digits = len(str(n))
+	lead = str(n // 10 ** (digits - 3))  # 3 significant digits, truncated (never rounds up to 1000K)
+	group = (digits - 1) // 3
+	if group < len(SUFFIXES):
+		k = (digits - 1) % 3 + 1
+		text = lead[:k] + ("." + lead[k:]).rstrip("0").rstrip(".")
+		return text + SUFFIXES[group]
+	return (lead[0] + ("." + lead[1:]).rstrip("0").rstrip(".")) + f"e{digits - 1}"
+
+
+class CookieEngine:
+	def __init__(self, upgrades=UPGRADES):
+		self.upgrades = upgrades
+		self.cookies = 0
+		self.perClick = 1
+		self.perSecond = 0
+		self.bought = set()  # indexes into upgrades
+		# Passive income is paid once per whole second; carry keeps the
+		# fraction of a second not paid yet, so advance(0.3) x 10 == advance(3)
+		self.carry = 0.0
+		self.elapsed = 0.0  # total seconds of game time
+		self.savedAt = None  # wall-clock time of the last save/load
+
+	# Player actions
+	def click(self, times=1):
+		earned = self.perClick * times
+		self.cookies += earned
+		return earned
+
+	def canAfford(self, index):
+		return index not in self.bought and self.cookies >= self.upgrades[index]['cost']
+
+	def buy(self, index):
+		if not self.canAfford(index):
+			return False
+		upgrade = self.upgrades[index]
+		self.cookies -= upgrade['cost']
+		self.bought.add(index)
+		self.applyEffect(upgrade['effect'])
+		return True
+
+	def applyEffect(self, effect):
+		kind, amount = effect
+		if kind == "click":
+			self.perClick += amount
+		elif kind == "passive":
+			self.perSecond += amount
+		elif kind == "cookies":
+			self.cookies += amount
+		else:
+			raise ValueError(f"Unknown upgrade effect: {kind}")
+
+	# Time
+	def advance(self, seconds):
+		"""Run the economy for seconds of game time; returns the cookies earned."""
+		if seconds <= 0:
+			return 0
+		total = self.carry + seconds
+		ticks = int(total)
+		self.carry = total - ticks
+		self.elapsed += seconds
+		earned = ticks * self.perSecond
+		self.cookies += earned
+		return earned
+
+	def fastForward(self, seconds=0, minutes=0, hours=0, days=0):
+		return self.advance(seconds + 60 * minutes + 3600 * hours + 86400 * days)
+
+	def timeUntil(self, amount):
+		"""Seconds of idle play until cookies >= amount (None if it never happens)."""
+		missing = amount - self.cookies
+		if missing <= 0:
+			return 0.0
+		if self.perSecond <= 0:
+			return None
+		ticks = -(-missing // self.perSecond)  # ceil
+		return max(0.0, ticks - self.carry)
+
+	# Save / offline progress
+	def toDict(self):
+		return {
+			"version": SAVE_VERSION,
+			"cookies": self.cookies,
+			"perClick": self.perClick,
+			"perSecond": self.perSecond,
+			"bought": sorted(self.bought),
+			"carry": self.carry,
+			"elapsed": self.elapsed,
+			"savedAt": self.savedAt,
+		}
+
+	@classmethod
+	def fromDict(cls, data, upgrades=UPGRADES):
+		engine = cls(upgrades)
+		engine.cookies = data.get("cookies", 0)
+		engine.perClick = data.get("perClick", 1)
+		engine.perSecond = data.get("perSecond", 0)
+		engine.bought = set(data.get("bought", []))
+		engine.carry = data.get("carry", 0.0)
+		engine.elapsed = data.get("elapsed", 0.0)
+		engine.savedAt = data.get("savedAt")
+		return engine
+
+	def applyOffline(self, now=None, maxSeconds=None):
+		"""Credit the time passed since the last save; returns (seconds, cookies earned)."""
+		if self.savedAt is None:
+			return 0.0, 0
+		now = time.time() if now is None else now
+		away = max(0.0, now - self.savedAt)
+		if maxSeconds is not None:
+			away = min(away, maxSeconds)
+		self.savedAt = now
+		return away, self.advance(away)
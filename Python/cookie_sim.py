@@ -0,0 +1,215 @@
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cookie_engine import CookieEngine, UPGRADES, formatNumber, loadUpgrades
+
+# Headless Cookie Clicker economy, for balance questions such as
+# "what is the fastest way to N cookies, and how long does it take?".
+#
+# The player is modelled as clicking `cps` times per second on top of the
+# passive income, so income is a continuous rate:
+#   rate = perSecond + cps * perClick
+# (the game pays passive cookies once per whole second; over minutes of play
+# the difference is at most one second of income).
+#
+# optimalOrder() searches purchase orders with A*: a state is the set of
+# bought upgrades plus the time and cookies in hand, each step waits until
+# the next upgrade is affordable and buys it. States with the same upgrades
+# that are both later and poorer than another one are pruned.
+#
+#   python cookie_sim.py --target 10000 --cps 5
+#   python cookie_sim.py --target 10000 --variants 2000 --jitter 0.3 --workers 8
+#   python cookie_sim.py --target 1000000 --upgrades my_upgrades.json
+
+
+def upgradeDeltas(upgrades):
+	"""(cost, +perClick, +perSecond, +cookies) of each upgrade, as the engine applies it."""
+	deltas = []
+	for upgrade in upgrades:
+		engine = CookieEngine(upgrades)
+		engine.applyEffect(upgrade['effect'])
+		deltas.append((upgrade['cost'], engine.perClick - 1, engine.perSecond, engine.cookies))
+	return deltas
+
+
+def simulate(upgrades, order, target, cps=5.0, perClick=1, perSecond=0, cookies=0):
+	"""Time (s) to reach target cookies buying order (upgrade indexes) as soon as
+	each one is affordable; None if it is never reached."""
+	deltas = upgradeDeltas(upgrades)
+	t = 0.0
+	c = float(cookies)
+	for i in order:
+		cost, dClick, dPassive, grant = deltas[i]
+		rate = perSecond + cps * perClick
+		if c < cost:
+			if rate <= 0:
+				return None
+			t += (cost - c) / rate
+			c = cost
+		c += grant - cost
+		perClick += dClick
+		perSecond += dPassive
+	rate = perSecond + cps * perClick
+	if c >= target:
+		return t
+	return None if rate <= 0 else t + (target - c) / rate
+
+
+def greedyOrder(upgrades, cps=5.0):
+	"""Baseline: buy by best payback (cost per cookie/second gained), cheapest grants first."""
+	deltas = upgradeDeltas(upgrades)
+
+	def payback(i):
+		cost, dClick, dPassive, grant = deltas[i]
+		gain = dPassive + cps * dClick
+		if gain > 0:
+			return cost / gain
+		return float("inf") if grant <= cost else 0.0
+
+	return sorted((i for i in range(len(upgrades)) if payback(i) != float("inf")), key=payback)
+
+
+def optimalOrder(upgrades, target, cps=5.0, perClick=1, perSecond=0, cookies=0, maxNodes=200000):
+	"""Purchase order reaching target cookies in minimum time.
+
+	Returns (seconds, order, optimal): optimal is False if maxNodes states were
+	expanded before the search finished (the order is then the best found).
+	"""
+	deltas = upgradeDeltas(upgrades)
+	n = len(deltas)
+	bestRate = perSecond + cps * perClick + sum(max(0, dp) + cps * max(0, dc) for _, dc, dp, _ in deltas)
+
+	def bound(t, c, mask):
+		# Optimistic finish time: every remaining upgrade free, all grants at once
+		grants = sum(deltas[i][3] for i in range(n) if not mask >> i & 1)
+		missing = target - c - grants
+		if missing <= 0:
+			return t
+		return t + missing / bestRate if bestRate > 0 else float("inf")
+
+	def finish(t, c, rate):
+		if c >= target:
+			return t
+		return t + (target - c) / rate if rate > 0 else float("inf")
+
+	rate0 = perSecond + cps * perClick
+	best = (finish(0.0, cookies, rate0), [])
+	seen = {}  # mask -> [(t, c)] non-dominated states
+	counter = 0
+	heap = [(bound(0.0, cookies, 0), counter, 0.0, float(cookies), 0, perClick, perSecond, [])]
+	expanded = 0
+	while heap:
+		lower, _, t, c, mask, pc, ps, order = heapq.heappop(heap)
+		if lower >= best[0]:
+			return best[0], best[1], True  # nothing left can beat the best order
+		expanded += 1
+		if expanded > maxNodes:
+			return best[0], best[1], False
+		rate = ps + cps * pc
+		for i in range(n):
+			if mask >> i & 1:
+				continue
+			cost, dClick, dPassive, grant = deltas[i]
+			nt, nc = t, c
+			if nc < cost:
+				if rate <= 0:
+					continue
+				nt += (cost - nc) / rate
+				nc = cost
+			nc += grant - cost
+			nmask = mask | 1 << i
+			states = seen.setdefault(nmask, [])
+			if any(st <= nt and sc >= nc for st, sc in states):
+				continue  # dominated
+			states[:] = [(st, sc) for st, sc in states if not (nt <= st and nc >= sc)]
+			states.append((nt, nc))
+			npc, nps = pc + dClick, ps + dPassive
+			norder = order + [i]
+			done = finish(nt, nc, nps + cps * npc)
+			if done < best[0]:
+				best = (done, norder)
+			lower = bound(nt, nc, nmask)
+			if lower < best[0]:
+				counter += 1
+				heapq.heappush(heap, (lower, counter, nt, nc, nmask, npc, nps, norder))
+	return best[0], best[1], True
+
+
+def evaluate(job):
+	"""Worker: optimal and greedy times for one catalogue variant."""
+	upgrades, target, cps = job
+	seconds, order, optimal = optimalOrder(upgrades, target, cps)
+	greedy = simulate(upgrades, greedyOrder(upgrades, cps), target, cps)
+	return {"seconds": seconds, "order": order, "optimal": optimal, "greedy": greedy}
+
+
+def evaluateVariants(variants, target, cps=5.0, workers=None):
+	"""Evaluate many catalogues in parallel; results are in the order of variants."""
+	jobs = [(upgrades, target, cps) for upgrades in variants]
+	if workers == 1:
+		return [evaluate(job) for job in jobs]
+	workers = workers or os.cpu_count() or 1
+	chunksize = max(1, len(jobs) // (workers * 4))
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		return list(pool.map(evaluate, jobs, chunksize=chunksize))
+
+
+def jitterCatalogue(upgrades, amount, rng):
+	"""Copy of upgrades with every cost scaled by a random factor in [1 - amount, 1 + amount]."""
+	return [dict(u, cost=max(1, round(u['cost'] * rng.uniform(1 - amount, 1 + amount)))) for u in upgrades]
+
+
+def formatTime(seconds):
+	if seconds is None or seconds == float("inf"):
+		return "never"
+	minutes, s = divmod(seconds, 60)
+	return f"{int(minutes)}m{s:04.1f}s" if minutes else f"{s:.1f}s"
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Cookie Clicker economy simulator / purchase optimizer")
+	parser.add_argument("--target", type=int, default=10000, help="cookies to reach")
+	parser.add_argument("--cps", type=float, default=5.0, help="player clicks per second")
+	parser.add_argument("--upgrades", help="upgrade catalogue file (default: the game's)")
+	parser.add_argument("--variants", type=int, default=0, help="evaluate N random catalogue variants")
+	parser.add_argument("--jitter", type=float, default=0.3, help="cost jitter of the variants (0.3 = +/-30%%)")
+	parser.add_argument("--seed", type=int, default=1)
+	parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+	args = parser.parse_args(argv)
+
+	upgrades = loadUpgrades(args.upgrades) if args.upgrades else UPGRADES
+	start = time.perf_counter()
+	if not args.variants:
+		seconds, order, optimal = optimalOrder(upgrades, args.target, args.cps)
+		greedy = simulate(upgrades, greedyOrder(upgrades, args.cps), args.target, args.cps)
+		print(f"Fastest way to {formatNumber(args.target)} cookies at {args.cps:g} clicks/s: "
+			f"{formatTime(seconds)}{'' if optimal else ' (search cut short)'}")
+		for i in order:
+			print(f"  buy {upgrades[i]['name']} ({formatNumber(upgrades[i]['cost'])})")
+		print(f"Greedy payback order: {formatTime(greedy)}")
+	else:
+		rng = random.Random(args.seed)
+		variants = [jitterCatalogue(upgrades, args.jitter, rng) for _ in range(args.variants)]
+		results = evaluateVariants(variants, args.target, args.cps, args.workers)
+		times = sorted(r["seconds"] for r in results)
+		gaps = [r["greedy"] / r["seconds"] - 1 for r in results if r["greedy"] and r["seconds"]]
+		print(f"{len(results)} variants, optimal time to {formatNumber(args.target)}: "
+			f"min {formatTime(times[0])}, median {formatTime(times[len(times) // 2])}, max {formatTime(times[-1])}")
+		if gaps:
+			print(f"greedy is {sum(gaps) / len(gaps):.1%} slower on average, {max(gaps):.1%} at worst")
+		else:
+			print("no comparable variants (the target is never reached, or reached at once)")
+		cut = sum(1 for r in results if not r["optimal"])
+		if cut:
+			print(f"{cut} searches were cut short")
+	print(f"({time.perf_counter() - start:.2f}s)")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
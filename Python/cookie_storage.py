@@ -0,0 +1,175 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from cookie_engine import CookieEngine, UPGRADES
+
+# Persistent saves for Cookie Clicker: a compact snapshot of the whole engine,
+# plus an append-only journal of what happened since (clicks, purchases, time).
+#
+# The game thread only records events in memory (consecutive clicks and ticks are
+# merged) and hands them over in batches; a background thread does all the file
+# I/O. A new snapshot is taken every snapshotEvery seconds or maxEvents journal
+# lines, so loading replays at most that much journal, however long the game.
+#
+# Journal lines: "<seq> c <clicks>", "<seq> b <upgrade index>",
+# "<seq> t <seconds> <wall clock>". The snapshot stores the seq of the last
+# event it contains; recovery replays the journal lines after it and ignores
+# a torn last line.
+
+
+class JournaledSave:
+	def __init__(self, path, snapshotEvery=60.0, maxEvents=5000, upgrades=UPGRADES):
+		self.path = path
+		self.journalPath = path + ".journal"
+		self.snapshotEvery = snapshotEvery
+		self.maxEvents = maxEvents
+		self.upgrades = upgrades
+		self.engine = None
+		self.seq = 0
+		self.pending = []  # [kind, value] not handed to the writer yet
+		self.journalEvents = 0  # lines written since the last snapshot
+		self.lastSnapshot = time.monotonic()
+		self.queue = queue.Queue()
+		self.thread = None
+
+	# Loading / recovery
+	def load(self):
+		"""Engine from the last snapshot plus the journal written after it."""
+		data = {}
+		if os.path.exists(self.path):
+			with open(self.path, encoding="utf-8") as f:
+				data = json.load(f)
+		engine = CookieEngine.fromDict(data, self.upgrades)  # a new game without a snapshot
+		snapSeq = data.get("seq", 0)
+		self.seq = snapSeq
+		if os.path.exists(self.journalPath):
+			with open(self.journalPath, "r+b") as f:
+				good = 0  # bytes up to the end of the last valid line
+				for raw in f:
+					event = self.parse(raw.decode("utf-8", "replace"))
+					if event is None:
+						# Torn write at the end of the file: cut it off, or the next
+						# append would be glued to it and read back as a bogus event
+						f.truncate(good)
+						break
+					good += len(raw)
+					seq, kind, args = event
+					if seq <= snapSeq:
+						continue
+					self.apply(engine, kind, args)
+					self.seq = seq
+		self.engine = engine
+		return engine
+
+	@staticmethod
+	def parse(line):
+		if not line.endswith("\n"):
+			return None
+		parts = line.split()
+		try:
+			seq = int(parts[0])
+			kind = parts[1]
+			if kind == "c" or kind == "b":
+				return seq, kind, (int(parts[2]),)
+			if kind == "t":
+				return seq, kind, (float(parts[2]), float(parts[3]))
+		except (IndexError, ValueError):
+			pass
+		return None
+
+	@staticmethod
+	def apply(engine, kind, args):
+		if kind == "c":
+			engine.click(args[0])
+		elif kind == "b":
+			engine.buy(args[0])
+		elif kind == "t":
+			engine.advance(args[0])
+			engine.savedAt = args[1]  # offline progress starts from the last recorded tick
+
+	# Recording (game thread)
+	def start(self, engine=None):
+		"""Start the writer thread; with engine, it becomes the engine being saved."""
+		if engine is not None:
+			self.engine = engine
+		if self.thread is None:
+			self.thread = threading.Thread(target=self.writer, name="cookie-save", daemon=True)
+			self.thread.start()
+
+	def record(self, kind, value):
+		last = self.pending[-1] if self.pending else None
+		if last is not None and last[0] == kind and kind != "b":
+			last[1] += value
+		else:
+			self.pending.append([kind, value])
+
+	def click(self, times=1):
+		self.record("c", times)
+
+	def buy(self, index):
+		self.record("b", index)
+
+	def tick(self, seconds):
+		if seconds > 0:
+			self.record("t", seconds)
+
+	def flush(self):
+		"""Hand the pending events to the writer thread; takes a snapshot when one is due."""
+		if self.pending:
+			now = time.time()
+			lines = []
+			for kind, value in self.pending:
+				self.seq += 1
+				if kind == "t":
+					lines.append(f"{self.seq} t {value!r} {now!r}\n")
+				else:
+					lines.append(f"{self.seq} {kind} {value}\n")
+			self.pending = []
+			self.journalEvents += len(lines)
+			self.queue.put(("journal", "".join(lines)))
+		if self.journalEvents >= self.maxEvents or time.monotonic() - self.lastSnapshot >= self.snapshotEvery:
+			self.snapshot()
+
+	def snapshot(self):
+		# The state is copied here, on the game thread, so it matches self.seq exactly
+		self.engine.savedAt = time.time()
+		data = self.engine.toDict()
+		data["seq"] = self.seq
+		self.queue.put(("snapshot", data))
+		self.journalEvents = 0
+		self.lastSnapshot = time.monotonic()
+
+	def close(self):
+		"""Write everything, take a final snapshot and stop the writer thread."""
+		self.flush()
+		self.snapshot()
+		self.queue.put(("stop", None))
+		if self.thread is not None:
+			self.thread.join()
+			self.thread = None
+
+	# Writer thread
+	def writer(self):
+		journal = open(self.journalPath, "a", encoding="utf-8")
+		try:
+			while True:
+				kind, payload = self.queue.get()
+				if kind == "journal":
+					journal.write(payload)
+					journal.flush()
+				elif kind == "snapshot":
+					tmp = self.path + ".tmp"
+					with open(tmp, "w", encoding="utf-8") as f:
+						json.dump(payload, f)
+					os.replace(tmp, self.path)
+					# Everything in the journal is now in the snapshot. If we crash
+					# before truncating, the seq numbers keep it from being replayed twice.
+					journal.close()
+					journal = open(self.journalPath, "w", encoding="utf-8")
+				elif kind == "stop":
+					break
+		finally:
+			journal.close()
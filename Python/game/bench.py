@@ -0,0 +1,261 @@
+"""
+bench.py
+
+Banc d'essai reproductible pour les chemins chauds de platformer.py, sans fenêtre
+(pilote vidéo SDL "dummy").
+
+Pour chaque taille de niveau synthétique (plateformes / ennemis), mesure:
+  - steps/s de World.step (et avec EntityBatch si numpy est installé, et avec
+    des régions d'activité: active_radius=ACTIVE_RADIUS)
+  - temps moyen par pas des phases update / collisions / pickups (via Profiler)
+  - temps de CameraGroup.draw par frame, avec et sans bake_static, et en mode dirty
+  - temps de construction du niveau
+  - pic mémoire Python (tracemalloc) de chaque sous-système, mesuré à part:
+    construction (peak_kb), pas de physique (step_peak_kb), EntityBatch
+    (batch_peak_kb), boucle de dessin (draw_peak_kb, draw_baked_peak_kb)
+  - mémoire des pixels des chunks pré-rendus (chunks_kb): allouée par SDL,
+    tracemalloc ne la voit pas, elle est donc comptée à partir des Surfaces
+  - temps de tile_image sur une bande de sol
+
+Utilisation:
+  python bench.py                              # tailles par défaut, affiche un tableau
+  python bench.py --sizes 100:10 1000:100      # plateformes:ennemis
+  python bench.py --save-baseline bench_baseline.json
+  python bench.py --baseline bench_baseline.json --tolerance 0.25
+      -> code de sortie 1 si une mesure est plus mauvaise que la référence de plus de 25 %
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+import platformer
+from platformer import (Platform, Enemy, Player, World, CameraGroup, InputFrame, TILE,
+                        make_placeholder_sprite, tile_image)
+from profiler import Profiler
+
+DEFAULT_SIZES = [(100, 10), (1_000, 100), (10_000, 1_000), (100_000, 10_000)]
+SCREEN = (800, 600)
+ACTIVE_RADIUS = 256
+
+# Mesures et sens de comparaison avec la référence (True: plus grand = mieux)
+METRICS = {
+    "steps_per_sec": True,
+    "batch_steps_per_sec": True,
+    "active_steps_per_sec": True,
+    "update_us": False,
+    "collisions_us": False,
+    "pickups_us": False,
+    "draw_ms": False,
+    "draw_baked_ms": False,
+    "draw_dirty_ms": False,
+    "build_ms": False,
+    "peak_kb": False,
+    "step_peak_kb": False,
+    "batch_peak_kb": False,
+    "draw_peak_kb": False,
+    "draw_baked_peak_kb": False,
+    "chunks_kb": False,
+}
+
+
+def make_level(n_platforms: int, n_enemies: int, seed: int = 1):
+    """Niveau synthétique: une bande de sol continue en tiles + plateformes flottantes
+    + ennemis qui patrouillent sur le sol. Toujours le même pour une graine donnée."""
+    rng = random.Random(seed)
+    tile_img = make_placeholder_sprite("", (TILE, TILE), (100, 100, 100))
+    enemy_img = make_placeholder_sprite("", (TILE, TILE), (200, 50, 50))
+    n_ground = max(1, n_platforms * 2 // 3)
+    platforms = [Platform(i * TILE, 0, TILE, TILE, image=tile_img) for i in range(n_ground)]
+    width = n_ground * TILE
+    for _ in range(n_platforms - n_ground):
+        x = rng.randrange(0, width, TILE)
+        y = -TILE * rng.randint(3, 12)
+        platforms.append(Platform(x, y, TILE, TILE, image=tile_img))
+    enemies = []
+    for _ in range(n_enemies):
+        x = rng.randrange(TILE * 20, max(width, TILE * 21), TILE)
+        enemies.append(Enemy(x, -TILE, TILE, TILE, patrol=(x, x + TILE * 6), speed=60, image=enemy_img))
+    player = Player(TILE * 2, -TILE * 2, image=make_placeholder_sprite("", (TILE, TILE * 2), (50, 150, 50)))
+    return player, platforms, enemies
+
+
+def script(n: int) -> list:
+    """Entrées scriptées: avance à droite en sautant régulièrement."""
+    return [InputFrame(right=True, jump_pressed=(i % 60 == 0), jump_held=(i % 60 < 30)) for i in range(n)]
+
+
+def build_world(n_platforms, n_enemies, **kwargs) -> World:
+    player, platforms, enemies = make_level(n_platforms, n_enemies)
+    return World(player, platforms=platforms, enemies=enemies, **kwargs)
+
+
+def peak_kb(fn) -> float:
+    """Pic des allocations Python faites pendant fn() (Ko), hors mesures de temps."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def draw_loop(cam: CameraGroup, world: World, screen: pygame.Surface, inputs: list) -> float:
+    """La caméra suit le joueur sur la séquence d'entrées; retourne le temps de draw total."""
+    total = 0.0
+    for frame in inputs:
+        world.step(frame)
+        cam.set_center(*world.player.rect.center)
+        t = time.perf_counter()
+        cam.draw(screen)
+        total += time.perf_counter() - t
+    return total
+
+
+def bench_size(n_platforms: int, n_enemies: int, steps: int, frames: int) -> dict:
+    out = {}
+
+    # Construction + mémoire
+    tracemalloc.start()
+    t = time.perf_counter()
+    world = build_world(n_platforms, n_enemies)
+    out["build_ms"] = (time.perf_counter() - t) * 1000
+    out["peak_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    # Physique
+    inputs = script(steps)
+    t = time.perf_counter()
+    world.run(inputs)
+    out["steps_per_sec"] = steps / (time.perf_counter() - t)
+    world = build_world(n_platforms, n_enemies)
+    out["step_peak_kb"] = peak_kb(lambda: world.run(inputs))
+
+    # Détail par phase (avec Profiler, donc un peu plus lent)
+    world = build_world(n_platforms, n_enemies)
+    prof = platformer.PROFILER = Profiler()
+    prof.begin_frame()
+    world.run(inputs)
+    prof.end_frame()
+    platformer.PROFILER = None
+    for phase in ("update", "collisions", "pickups"):
+        out[f"{phase}_us"] = prof.phases.get(phase, 0.0) / steps * 1e6
+
+    if platformer.np is not None:
+        world = build_world(n_platforms, n_enemies, batch=True)
+        t = time.perf_counter()
+        world.run(inputs)
+        out["batch_steps_per_sec"] = steps / (time.perf_counter() - t)
+        world = build_world(n_platforms, n_enemies, batch=True)
+        out["batch_peak_kb"] = peak_kb(lambda: world.run(inputs))
+
+    world = build_world(n_platforms, n_enemies, active_radius=ACTIVE_RADIUS)
+    t = time.perf_counter()
+    world.run(inputs)
+    out["active_steps_per_sec"] = steps / (time.perf_counter() - t)
+
+    # Dessin
+    screen = pygame.display.get_surface()
+    for key, bake, dirty in (("draw_ms", False, False), ("draw_baked_ms", True, False),
+                             ("draw_dirty_ms", False, True)):
+        world = build_world(n_platforms, n_enemies)
+        cam = CameraGroup(*SCREEN, bake_static=bake, dirty=dirty)
+        world.attach(cam)
+        out[key] = draw_loop(cam, world, screen, inputs[:frames]) / frames * 1000
+    for key, bake in (("draw_peak_kb", False), ("draw_baked_peak_kb", True)):
+        world = build_world(n_platforms, n_enemies)
+        cam = CameraGroup(*SCREEN, bake_static=bake)
+        world.attach(cam)
+        out[key] = peak_kb(lambda: draw_loop(cam, world, screen, inputs[:frames]))
+    out["chunks_kb"] = sum(surf.get_bytesize() * surf.get_width() * surf.get_height()
+                           for surf in cam._chunks.values() if surf is not None) / 1024
+    return out
+
+
+def bench_tile_image(repeat: int = 20) -> float:
+    texture = make_placeholder_sprite("", (TILE, TILE), (100, 100, 100))
+    t = time.perf_counter()
+    for _ in range(repeat):
+        tile_image(texture, TILE * 69, TILE * 2)
+    return (time.perf_counter() - t) / repeat * 1000
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Liste des régressions (texte) par rapport à la référence."""
+    failures = []
+    for size, metrics in results.items():
+        ref = baseline.get(size)
+        if not isinstance(ref, dict):
+            continue
+        for name, higher_is_better in METRICS.items():
+            if name not in metrics or not ref.get(name):
+                continue
+            new, old = metrics[name], ref[name]
+            worse = (old - new) / old if higher_is_better else (new - old) / old
+            if worse > tolerance:
+                failures.append(f"{size} {name}: {new:.3f} vs {old:.3f} ({worse:+.0%})")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="*", help="tailles plateformes:ennemis (ex: 1000:100)")
+    parser.add_argument("--steps", type=int, default=600, help="pas de physique par mesure")
+    parser.add_argument("--frames", type=int, default=300, help="frames de dessin par mesure")
+    parser.add_argument("--baseline", help="fichier JSON de référence à comparer")
+    parser.add_argument("--save-baseline", help="écrit les résultats comme nouvelle référence")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="dégradation tolérée (0.25 = 25 %%)")
+    args = parser.parse_args(argv)
+
+    sizes = DEFAULT_SIZES
+    if args.sizes:
+        sizes = [tuple(int(v) for v in s.split(":")) for s in args.sizes]
+
+    pygame.init()
+    pygame.display.set_mode(SCREEN)
+
+    results = {}
+    for n_platforms, n_enemies in sizes:
+        key = f"{n_platforms}p/{n_enemies}e"
+        results[key] = bench_size(n_platforms, n_enemies, args.steps, args.frames)
+        row = results[key]
+        print(f"{key:>16}  " + "  ".join(f"{k}={row[k]:.2f}" for k in METRICS if k in row), flush=True)
+    results["tile_image_ms"] = bench_tile_image()
+    print(f"{'tile_image':>16}  69x2 tiles = {results['tile_image_ms']:.3f} ms")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, args.tolerance)
+        old_tile = baseline.get("tile_image_ms")
+        if old_tile and (results["tile_image_ms"] - old_tile) / old_tile > args.tolerance:
+            failures.append(f"tile_image_ms: {results['tile_image_ms']:.3f} vs {old_tile:.3f}")
+        if failures:
+            print("\nRÉGRESSIONS:", file=sys.stderr)
+            for line in failures:
+                print("  " + line, file=sys.stderr)
+            status = 1
+        else:
+            print(f"\nOK: aucune mesure plus de {args.tolerance:.0%} moins bonne que la référence")
+
+    pygame.quit()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,133 +1,136 @@
-"""
-demo_platformer.py
-
-Petite démo utilisant platformer.py — montre comment initialiser une fenêtre, créer
-quelques objets, et déplacer le joueur avec les touches fléchées + Espace.
-
-⚠️ Nécessite pygame et platformer.py dans le même dossier.
-
-Contrôles :
-  ← →  : se déplacer
-  ESPACE : sauter
-  ÉCHAP : quitter
-"""
-
-import pygame
-from platformer import Player, Platform, Coin, MovingPlatform, OneWayPlatform, Enemy, CameraGroup, TILE, load_image, tile_image
-
-pygame.init()
-
-# --- Config écran ---
-WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-clock = pygame.time.Clock()
-pygame.display.set_caption("Démo Platformer")
-
-# --- Groupes ---
-all_sprites = CameraGroup(WIDTH, HEIGHT)
-platforms = pygame.sprite.Group()
-coins = pygame.sprite.Group()
-enemies = pygame.sprite.Group()
-
-# --- Création d'objets ---
-player_texture = load_image("mario.png", (TILE, TILE * 2))
-player = Player(100, -50, image=player_texture)
-
-# Sol et plateformes
-sol_texture = load_image("ground.png", (TILE, TILE))
-brique_texture = load_image("brick.png", (TILE, TILE))
-bloc_texture = load_image("block.png", (TILE, TILE))
-tuyau2_texture = load_image("pipe.png", (TILE * 2, TILE * 2))
-tuyau3_texture = load_image("pipe.png", (TILE * 2, TILE * 3))
-tuyau4_texture = load_image("pipe.png", (TILE * 2, TILE * 4))
-drapeau_texture = load_image("flag.png", (TILE * 2, TILE * 11))
-sol1 = Platform(0, 0, TILE * 69, TILE * 2, image = tile_image(sol_texture, TILE * 69, TILE * 2))
-sol2 = Platform(TILE * 71, 0, TILE * 15, TILE * 2, image = tile_image(sol_texture, TILE * 15, TILE * 2))
-sol3 = Platform(TILE * 89, 0, TILE * 64, TILE * 2, image = tile_image(sol_texture, TILE * 64, TILE * 2))
-sol4 = Platform(TILE * 153, 0, TILE * 69, TILE * 2, image = tile_image(sol_texture, TILE * 69, TILE * 2))
-bloc1 = Platform(TILE * 16, TILE * -4, TILE, TILE, image=bloc_texture)
-brique1 = Platform(TILE * 20, TILE * -4, TILE, TILE, image=brique_texture)
-bloc2 = Platform(TILE * 21, TILE * -4, TILE, TILE, image=bloc_texture)
-brique2 = Platform(TILE * 22, TILE * -4, TILE, TILE, image=brique_texture)
-bloc3 = Platform(TILE * 23, TILE * -4, TILE, TILE, image=bloc_texture)
-brique3 = Platform(TILE * 24, TILE * -4, TILE, TILE, image=brique_texture)
-bloc4 = Platform(TILE * 22, TILE * -8, TILE, TILE, image=bloc_texture)
-tuyau1 = Platform(TILE * 28, TILE * -2, TILE * 2, TILE * 2, image=tuyau2_texture)
-tuyau2 = Platform(TILE * 38, TILE * -3, TILE * 2, TILE * 3, image=tuyau3_texture)
-tuyau3 = Platform(TILE * 46, TILE * -4, TILE * 2, TILE * 4, image=tuyau4_texture)
-tuyau4 = Platform(TILE * 57, TILE * -4, TILE * 2, TILE * 4, image=tuyau4_texture)
-drapeau = Platform(TILE * 64, TILE * -11, TILE * 2, TILE * 11, image=drapeau_texture)
-oneway = OneWayPlatform(500, 350, 200, 20)
-
-# Pièces et ennemis
-goomba_texture = load_image("goomba.png", (TILE, TILE))
-coin_texture = load_image("coin.png", (TILE, TILE))
-coin1 = Coin(250, 0, image=coin_texture)
-coin2 = Coin(520, TILE * -1, image=coin_texture)
-enemy1 = Enemy(TILE * 22, TILE * -1, TILE, TILE, patrol=(TILE * 22, 0), speed=60, image=goomba_texture)
-enemy2 = Enemy(TILE * 40, TILE * -1, TILE, TILE, patrol=(TILE * 40, TILE * 45), speed=60, image=goomba_texture)
-enemy3 = Enemy(TILE * 51, TILE * -1, TILE, TILE, patrol=(TILE * 48, TILE * 56), speed=60, image=goomba_texture)
-enemy4 = Enemy(TILE * 52.5, TILE * -1, TILE, TILE, patrol=(TILE * 48, TILE * 56), speed=60, image=goomba_texture)
-
-# Ajout aux groupes
-for obj in [player, sol1, sol2, sol3, sol4, bloc1, bloc2, bloc3, bloc4, brique1, brique2, brique3, tuyau1, tuyau2, tuyau3, tuyau4, drapeau, oneway, coin1, coin2, enemy1, enemy2, enemy3, enemy4]:
-    all_sprites.add(obj)
-
-for p in [sol1, sol2, sol3, sol4, bloc1, bloc2, bloc3, bloc4, brique1, brique2, brique3, tuyau1, tuyau2, tuyau3, tuyau4, drapeau, oneway]:
-    platforms.add(p)
-for c in [coin1, coin2]:
-    coins.add(c)
-for e in [enemy1, enemy2, enemy3, enemy4]:
-    enemies.add(e)
-
-# --- Boucle principale ---
-running = True
-score = 0
-while running:
-    dt = clock.tick(60) / 1000.0  # secondes
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-            running = False
-
-    keys = pygame.key.get_pressed()
-    left = keys[pygame.K_LEFT] or keys[pygame.K_a]
-    right = keys[pygame.K_RIGHT] or keys[pygame.K_d]
-    jump_pressed = keys[pygame.K_SPACE]
-
-    # --- Update logique ---
-    player.apply_input(left, right, jump_pressed, jump_pressed, dt)
-
-    for obj in all_sprites:
-        if hasattr(obj, 'update'):
-            obj.update(dt, world={'platforms': platforms})
-
-    player.resolve_collisions(platforms)
-
-    # Collecte de pièces
-    collected = pygame.sprite.spritecollide(player, coins, dokill=True)
-    for c in collected:
-        score += c.value
-
-    # Collisions ennemis (simple reset de position)
-    if pygame.sprite.spritecollideany(player, enemies):
-        player.rect.topleft = (100, -50)
-        player.vx = player.vy = 0
-
-    # --- Caméra ---
-    all_sprites.set_center(player.rect.centerx, player.rect.centery)
-
-    # --- Rendu ---
-    screen.fill((80, 160, 220))
-    all_sprites.draw(screen)
-
-    # HUD score
-    font = pygame.font.Font(None, 36)
-    txt = font.render(f"Score: {score}", True, (0, 0, 0))
-    screen.blit(txt, (10, 10))
-
-    pygame.display.flip()
-
-pygame.quit()
+"""
+demo_platformer.py
+
+Petite démo utilisant platformer.py — montre comment initialiser une fenêtre, charger
+un niveau (levels/demo.json), et déplacer le joueur avec les touches fléchées + Espace.
+
+⚠️ Nécessite pygame et platformer.py dans le même dossier.
+
+Contrôles :
+  ← →  : se déplacer
+  ESPACE : sauter
+  F3 : afficher / cacher les mesures (avec --profile)
+  ÉCHAP : quitter
+
+Options :
+  --profile [FICHIER] : mesure chaque frame, écrit FICHIER.csv et FICHIER.json en quittant
+  --dirty : ne redessine et n'envoie à l'écran que les zones modifiées (machines lentes)
+  --record [FICHIER] : enregistre les entrées dans FICHIER (rejouer avec replay.py)
+"""
+
+import argparse
+import os
+import pygame
+import platformer
+from platformer import CameraGroup, AssetCache, Level, InputFrame, HudText, LEVEL_DIR
+from profiler import Profiler, ProfilerOverlay
+from replay import Recorder
+
+parser = argparse.ArgumentParser(description="Démo Platformer")
+parser.add_argument("--profile", nargs="?", const="profile", default=None, metavar="FICHIER")
+parser.add_argument("--dirty", action="store_true", help="rendu par rectangles modifiés")
+parser.add_argument("--record", nargs="?", const="session.rpl", default=None, metavar="FICHIER")
+args = parser.parse_args()
+
+pygame.init()
+
+# --- Config écran ---
+WIDTH, HEIGHT = 800, 600
+FPS = 60  # cadence d'affichage; la physique tourne à pas fixe (PHYSICS_HZ) quel que soit FPS
+SKY = (80, 160, 220)
+screen = pygame.display.set_mode((WIDTH, HEIGHT))
+clock = pygame.time.Clock()
+pygame.display.set_caption("Démo Platformer")
+
+# --- Groupes ---
+# bake_static reste désactivé: sur les niveaux actuels, peu denses, copier des chunks
+# de 512x512 coûte plus cher que de dessiner les plateformes une par une (voir bench.py)
+all_sprites = CameraGroup(WIDTH, HEIGHT, dirty=args.dirty, background=SKY)
+
+# --- Niveau ---
+# Textures partagées: chaque PNG n'est décodé qu'une fois, les petites images vont dans un atlas
+assets = AssetCache(atlas_size=(512, 512))
+LEVEL = "demo.json"
+level = Level.load(os.path.join(LEVEL_DIR, LEVEL))
+# Seules les sections proches du joueur sont construites, le reste est chargé en chemin
+world = level.make_world(assets, stream=True)
+world.attach(all_sprites)
+player = world.player
+
+# --- HUD ---
+score_text = HudText("Score: {}", (10, 10))
+
+# --- Mesures (optionnelles) ---
+prof = overlay = None
+if args.profile:
+    prof = platformer.PROFILER = Profiler()
+    overlay = ProfilerOverlay(prof)
+recorder = Recorder(LEVEL, world) if args.record else None
+
+# --- Boucle principale ---
+running = True
+while running:
+    dt = clock.tick(FPS) / 1000.0  # secondes
+    if prof:
+        prof.begin_frame()
+
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and overlay:
+            overlay.visible = not overlay.visible
+
+    keys = pygame.key.get_pressed()
+    left = keys[pygame.K_LEFT] or keys[pygame.K_a]
+    right = keys[pygame.K_RIGHT] or keys[pygame.K_d]
+    jump_pressed = keys[pygame.K_SPACE]
+    if prof:
+        prof.mark('events')
+
+    # --- Update logique ---
+    inputs = InputFrame(left, right, jump_pressed, jump_pressed)
+    alpha = recorder.advance(dt, inputs) if recorder else world.advance(dt, inputs)
+    if prof:
+        prof.mark('world')
+
+    # --- Caméra ---
+    px, py = player.render_pos(alpha)
+    all_sprites.set_center(px + player.rect.width // 2, py + player.rect.height // 2)
+
+    # --- Rendu ---
+    score_text.set(world.score)  # HUD re-rendu seulement quand le score change
+    if args.dirty:
+        # Le HUD est redessiné par-dessus: la caméra restaure le fond dessous
+        hud = [score_text.rect()]
+        if overlay and overlay.visible:
+            hud.append(overlay.rect(screen))
+        rects = all_sprites.draw(screen, alpha=alpha, overlays=hud)
+    else:
+        screen.fill(SKY)
+        all_sprites.draw(screen, alpha=alpha)
+    if prof:
+        prof.mark('draw')
+
+    score_text.draw(screen)
+    if overlay:
+        overlay.draw(screen)
+    if prof:
+        prof.mark('hud')
+
+    if args.dirty:
+        pygame.display.update(rects)
+    else:
+        pygame.display.flip()
+    if prof:
+        prof.mark('flip')
+        prof.end_frame()
+
+if recorder:
+    recorder.save(args.record)
+if prof:
+    prof.dump_csv(args.profile + ".csv")
+    prof.dump_json(args.profile + ".json")
+
+pygame.quit()
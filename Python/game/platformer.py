@@ -1,374 +1,1799 @@
-"""
-platformer.py
-
-Bibliothèque d'objets réutilisables pour un jeu de plateformes 2D (inspiré de Super Mario)
-Écrit en Python + pygame.
-
-Ce module NE crée PAS de niveau. Il fournit des classes et fonctions:
-  - GameObject (base)
-  - Player
-  - Platform (statique)
-  - MovingPlatform
-  - OneWayPlatform
-  - Coin
-  - Enemy (patrouille simple)
-  - Camera (groupe de sprites avec offset)
-  - make_placeholder_sprite(label, size, color)
-
-Utilisez ces classes pour construire vos propres niveaux ailleurs.
-
-Dépendances: pygame
-Installer: pip install pygame
-
-Exemples d'utilisation sont fournis dans la docstring de chaque classe mais rien n'est créé automatiquement
-parce que vous avez demandé explicitement: *ne crée pas de niveau*. 
-
-Auteur: généré par ChatGPT
-"""
-
-import pygame
-from pygame import Rect
-from typing import Tuple, Optional
-
-# ---- Configuration de base ------------------------------------------------
-TILE = 32  # taille par défaut des tiles / sprites
-GRAVITY = 100  # pixels / s^2
-TERMINAL_V = 800  # vitesse de chute max
-
-# ---- Utilitaires ----------------------------------------------------------
-
-import os
-
-ASSET_DIR = os.path.join(os.path.dirname(__file__), "assets")
-
-def load_image(name, size=None):
-    path = os.path.join(ASSET_DIR, name)
-    image = pygame.image.load(path).convert_alpha()
-    if size:
-        image = pygame.transform.scale(image, size)
-    return image
-
-def tile_image(texture, width, height):
-    """Répète une texture sur une surface de taille donnée."""
-    surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    tw, th = texture.get_size()
-    for x in range(0, width, tw):
-        for y in range(0, height, th):
-            surface.blit(texture, (x, y))
-    return surface
-
-def make_placeholder_sprite(label: str, size: Tuple[int, int], color: Tuple[int, int, int]):
-    """Crée une Surface servant de sprite placeholder.
-    label: texte affiché centré (ex: 'PLAYER', 'PLAT').
-    size: (w, h) en pixels.
-    color: (r,g,b).
-    Retourne: pygame.Surface
-    """
-    surf = pygame.Surface(size, pygame.SRCALPHA)
-    surf.fill(color)
-    try:
-        font = pygame.font.Font(None, max(12, size[1] // 3))
-        text = font.render(label, True, (255, 255, 255))
-        tr = text.get_rect(center=(size[0] // 2, size[1] // 2))
-        surf.blit(text, tr)
-    except Exception:
-        # Dans des environnements sans font, on ignore le texte
-        pass
-    return surf
-
-# ---- Base: GameObject -----------------------------------------------------
-class GameObject(pygame.sprite.Sprite):
-    """Base pour tous les objets du jeu.
-
-    Propriétés importantes:
-      - self.rect: Rect positionnel
-      - self.vx, self.vy: vitesses en pixels/sec
-      - self.solid: si True, participe aux collisions de plateforme
-
-    NOTE: les collisions se font par test AABB via rect.
-    """
-    def __init__(self, x: float, y: float, image: pygame.Surface):
-        super().__init__()
-        self.image = image
-        self.rect = self.image.get_rect(topleft=(int(x), int(y)))
-        self.vx = 0.0
-        self.vy = 0.0
-        self.solid = True
-
-    def update(self, dt: float, world: Optional[dict] = None):
-        """Mettre à jour l'objet.
-        dt: delta-time en secondes.
-        world: dictionnaire facultatif contenant des groupes/infos (ex: {'platforms': Group})
-        """
-        # Mouvement basique
-        self.rect.x += int(self.vx * dt)
-        self.rect.y += int(self.vy * dt)
-
-# ---- Plateformes ---------------------------------------------------------
-class Platform(GameObject):
-    """Plateforme statique simple.
-
-    Constructeur:
-        Platform(x, y, w, h, color=(100,100,100))
-    """
-    def __init__(self, x: float, y: float, w: int, h: int, color: Tuple[int, int, int] = (100,100,100), image = None):
-        if image:
-            img = image
-        else:
-            img = make_placeholder_sprite('PLAT', (w, h), color)
-        super().__init__(x, y, img)
-        self.solid = True
-
-class OneWayPlatform(Platform):
-    """Plateforme marchable uniquement quand le joueur tombe dessus (one-way).
-    La logique d'acceptation du contact doit être gérée depuis la détection de collisions
-    du Player (voir méthodes utilitaires dans Player).
-    """
-    def __init__(self, x, y, w, h, color=(120, 90, 60)):
-        super().__init__(x, y, w, h, color)
-        self.type = 'oneway'
-
-class MovingPlatform(Platform):
-    """Plateforme se déplaçant entre deux points.
-
-    args: path=((x1,y1),(x2,y2)), speed pixels/sec, loop True/False
-    """
-    def __init__(self, x, y, w, h, path: Tuple[Tuple[int,int], Tuple[int,int]], speed: float=100.0, color=(80,120,200)):
-        super().__init__(x, y, w, h, color)
-        self.path = [pygame.math.Vector2(p) for p in path]
-        self.speed = speed
-        self._target = 1
-        self.pos = pygame.math.Vector2(x, y)
-        self.solid = True
-
-    def update(self, dt: float, world: Optional[dict] = None):
-        if len(self.path) < 2:
-            return
-        target_pos = self.path[self._target]
-        dir_vec = (target_pos - self.pos)
-        dist = dir_vec.length()
-        if dist < 1e-6:
-            # switch
-            self._target = (self._target + 1) % len(self.path)
-            return
-        move = dir_vec.normalize() * self.speed * dt
-        if move.length() >= dist:
-            self.pos = target_pos
-            self._target = (self._target + 1) % len(self.path)
-        else:
-            self.pos += move
-        self.rect.topleft = (int(self.pos.x), int(self.pos.y))
-
-# ---- Collectibles -------------------------------------------------------
-class Coin(GameObject):
-    """Pièce ramassable. Quand on appelle collect(), elle s'enlève du groupe.
-
-    coin.collect() -> return valeur (int)
-    """
-    def __init__(self, x, y, value: int = 1, image = None):
-        if image:
-            img = image
-        else:
-            img = make_placeholder_sprite('COIN', (TILE//2, TILE//2), (220,180,0))
-        super().__init__(x, y, img)
-        self.value = value
-        self.solid = False
-
-    def collect(self):
-        # Par défaut retourne la valeur et kill() l'objet pour être retiré des groupes
-        try:
-            self.kill()
-        except Exception:
-            pass
-        return self.value
-
-# ---- Ennemi simple ------------------------------------------------------
-class Enemy(GameObject):
-    """Ennemi patrouillant horizontalement entre deux bornes.
-
-    enemy = Enemy(x, y, w, h, patrol=(x1,x2), speed)
-    """
-    def __init__(self, x, y, w: int, h: int, patrol: Tuple[int,int], speed: float = 60.0, color=(200,50,50), image=None):
-        if image:
-            img = image
-        else:
-            img = make_placeholder_sprite('ENEMY', (w, h), color)
-        super().__init__(x, y, img)
-        self.patrol = patrol
-        self.speed = speed
-        self.direction = 1
-        self.vx = speed
-        self.solid = True
-
-    def update(self, dt: float, world: Optional[dict] = None):
-        self.rect.x += int(self.vx * dt)
-        if self.rect.left < min(self.patrol):
-            self.rect.left = min(self.patrol)
-            self.vx = abs(self.speed)
-        elif self.rect.left > max(self.patrol):
-            self.rect.left = max(self.patrol)
-            self.vx = -abs(self.speed)
-
-# ---- Player -------------------------------------------------------------
-class Player(GameObject):
-    """Classe Player avec physiques simples (accélération, saut, collisions AABB).
-
-    Contrôles attendus par défaut: gauche/droite/jump (à gérer côté jeu).
-
-    Méthodes importantes:
-      - apply_input(left_bool, right_bool, jump_pressed_bool, jump_held_bool, dt)
-      - resolve_collisions(platforms_group)
-
-    Le jeu appelant doit gérer l'input et fournir les groupes de plateformes/coins/enemies.
-    """
-    def __init__(self, x: float, y: float, w: int = TILE, h: int = TILE*2, color: Tuple[int,int,int]=(50,150,50), image = None):
-        if image:
-            img = image
-        else:
-            img = make_placeholder_sprite('PLAYER', (w, h), color)
-        super().__init__(x, y, img)
-        # Movement
-        self.speed = 20.0  # pixels/sec horizontal max
-        self.accel = 100.0  # accel
-        self.friction = 100.0
-        self.jump_speed = 20.0
-        self.can_double_jump = False
-        self.jumps_left = 1
-        # State
-        self.on_ground = False
-        self.solid = True
-
-    def apply_input(self, left: bool, right: bool, jump_pressed: bool, jump_held: bool, dt: float):
-        # Horizontal accel
-        desired_vx = 0
-        if left and not right:
-            desired_vx = -self.speed
-        elif right and not left:
-            desired_vx = self.speed
-        # Simple approach: accelerate towards desired_vx
-        if self.vx < desired_vx:
-            self.vx = min(desired_vx, self.vx + self.accel * dt)
-        elif self.vx > desired_vx:
-            self.vx = max(desired_vx, self.vx - self.accel * dt)
-
-        # Gravity
-        self.vy += GRAVITY * dt
-        if self.vy > TERMINAL_V:
-            self.vy = TERMINAL_V
-
-        # Jump
-        if jump_pressed:
-            if self.on_ground or self.jumps_left > 0:
-                self.vy = -self.jump_speed
-                if not self.on_ground:
-                    self.jumps_left -= 1
-                self.on_ground = False
-
-        # Variable jump height: if jump released while moving up, reduce vy
-        if not jump_held and self.vy < 0:
-            self.vy += GRAVITY * 0.4 * dt  # drag upwards
-
-        # Apply movement
-        self.rect.x += self.vx * dt
-        self.rect.y += self.vy * dt
-        self.rect.x = int(self.rect.x)
-        self.rect.y = int(self.rect.y)
-
-    def resolve_collisions(self, platforms: pygame.sprite.Group):
-        """Résout les collisions avec les plateformes, proprement et sans glitchs."""
-        # --- Mouvement horizontal ---
-        self.rect.x += int(self.vx)
-        hits = pygame.sprite.spritecollide(self, platforms, dokill=False)
-        for p in hits:
-            if not p.solid:
-                continue
-            # Collision droite
-            if self.vx > 0 and self.rect.right > p.rect.left:
-                self.rect.right = p.rect.left
-                self.vx = 0
-            # Collision gauche
-            elif self.vx < 0 and self.rect.left < p.rect.right:
-                self.rect.left = p.rect.right
-                self.vx = 0
-
-        # --- Mouvement vertical ---
-        self.rect.y += int(self.vy)
-        self.on_ground = False
-        hits = pygame.sprite.spritecollide(self, platforms, dokill=False)
-        for p in hits:
-            if not p.solid:
-                continue
-
-            # Cas spécial : plateformes one-way (marchables que du dessus)
-            if hasattr(p, "type") and getattr(p, "type") == "oneway":
-                # On ne bloque que si on descend et qu'on arrive d'au-dessus
-                if self.vy <= 0:
-                    continue
-                if self.rect.bottom - self.vy > p.rect.top:
-                    continue
-
-            # Si on tombe et qu'on touche le haut de la plateforme
-            if self.vy > 0 and self.rect.bottom > p.rect.top and self.rect.top < p.rect.top:
-                self.rect.bottom = p.rect.top
-                self.vy = 0
-                self.on_ground = True
-                self.jumps_left = 1
-            # Si on monte et qu'on touche un plafond
-            elif self.vy < 0 and self.rect.top < p.rect.bottom and self.rect.bottom > p.rect.bottom:
-                self.rect.top = p.rect.bottom
-                self.vy = 0
-
-# ---- Camera / Drawing helpers -------------------------------------------
-class CameraGroup(pygame.sprite.Group):
-    """Groupe de sprites qui applique un offset (camera) lors du dessin.
-
-    Utilisation:
-      cam = CameraGroup(width, height)
-      cam.add(sprites...)
-      cam.draw(surface, camera_pos=(camx, camy))
-    """
-    def __init__(self, screen_w: int, screen_h: int):
-        super().__init__()
-        self.screen_w = screen_w
-        self.screen_h = screen_h
-        self.camera_pos = pygame.math.Vector2(0, 0)
-
-    def set_center(self, x: float, y: float):
-        # centre la caméra autour de x,y
-        self.camera_pos.x = x - self.screen_w // 2
-        self.camera_pos.y = y - self.screen_h // 2
-
-    def draw(self, surface: pygame.Surface, *args, **kwargs):
-        # Dessine tous les sprites avec l'offset camera
-        for spr in sorted(self.sprites(), key=lambda s: getattr(s, 'rect').bottom):
-            offset_rect = spr.rect.copy()
-            offset_rect.x -= int(self.camera_pos.x)
-            offset_rect.y -= int(self.camera_pos.y)
-            surface.blit(spr.image, offset_rect)
-
-# ---- Helpers pour niveaux (Factories) -----------------------------------
-
-def make_ground_segment(x: int, y: int, length_tiles: int) -> Platform:
-    """Crée une plateforme continue de length_tiles * TILE"""
-    return Platform(x, y, length_tiles * TILE, TILE)
-
-# ---- Fin du module: AUCUN main loop n'est exécuté ------------------------
-
-# Vous pouvez utiliser ces classes depuis un autre script. Exemple (non exécuté ici):
-#
-# from platformer import Player, Platform, Coin, MovingPlatform, CameraGroup
-# import pygame
-#
-# screen = pygame.display.set_mode((800, 600))
-# player = Player(100, 100)
-# ground = Platform(0, 500, 2000, 32)
-# coin = Coin(200, 450)
-# all_sprites = pygame.sprite.Group(player, ground, coin)
-# platforms = pygame.sprite.Group(ground)
-# cam = CameraGroup(800, 600)
-# cam.add(all_sprites)
-#
-# # Dans la boucle principale, appelez player.apply_input(...) puis player.resolve_collisions(platforms)
-# # puis cam.set_center(player.rect.centerx, player.rect.centery) et cam.draw(screen)
-
+"""
+platformer.py
+
+Bibliothèque d'objets réutilisables pour un jeu de plateformes 2D (inspiré de Super Mario)
+Écrit en Python + pygame.
+
+Ce module NE crée PAS de niveau. Il fournit des classes et fonctions:
+  - GameObject (base)
+  - Player
+  - Platform (statique)
+  - MovingPlatform
+  - OneWayPlatform
+  - Coin
+  - Enemy (patrouille simple)
+  - Camera (groupe de sprites avec offset)
+  - FontCache / HudText (polices partagées, texte re-rendu seulement s'il change)
+  - World / InputFrame (pas de simulation d'un niveau complet, sans affichage)
+  - Level / LevelStreamer (niveaux décrits dans un fichier, chargés par sections)
+  - EntityBatch (mise à jour vectorisée des Enemy / MovingPlatform, numpy)
+  - AssetCache / TextureAtlas (cache d'images, load_image() s'appuie dessus)
+  - SpatialHash / SpatialGroup (index spatial par cellules pour les collisions)
+  - make_placeholder_sprite(label, size, color)
+
+Utilisez ces classes pour construire vos propres niveaux ailleurs.
+
+Dépendances: pygame (numpy en option, pour EntityBatch)
+Installer: pip install pygame
+
+Exemples d'utilisation sont fournis dans la docstring de chaque classe mais rien n'est créé automatiquement
+parce que vous avez demandé explicitement: *ne crée pas de niveau*. 
+
+Auteur: généré par ChatGPT
+"""
+
+import math
+import pygame
+from pygame import Rect
+from collections import OrderedDict
+from typing import Tuple, Optional, NamedTuple, Iterable
+
+# ---- Configuration de base ------------------------------------------------
+TILE = 32  # taille par défaut des tiles / sprites
+GRAVITY = 6000  # pixels / s^2
+TERMINAL_V = 1800  # vitesse de chute max, pixels / s
+PHYSICS_HZ = 120  # fréquence du pas fixe de World.advance()
+PROFILER = None  # profiler.Profiler à renseigner pour activer l'instrumentation
+
+# ---- Utilitaires ----------------------------------------------------------
+
+import os
+
+try:
+    import numpy as np
+except ImportError:  # numpy est optionnel: seul EntityBatch en a besoin
+    np = None
+
+ASSET_DIR = os.path.join(os.path.dirname(__file__), "assets")
+LEVEL_DIR = os.path.join(os.path.dirname(__file__), "levels")
+
+def load_image(name, size=None):
+    """Image de ASSET_DIR, éventuellement redimensionnée.
+    Passe par le cache partagé ASSETS: ne pas modifier la Surface retournée.
+    """
+    return ASSETS.image(name, size)
+
+def tile_image(texture, width, height):
+    """Répète une texture sur une surface de taille donnée."""
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    tw, th = texture.get_size()
+    for x in range(0, width, tw):
+        for y in range(0, height, th):
+            surface.blit(texture, (x, y))
+    return surface
+
+def make_placeholder_sprite(label: str, size: Tuple[int, int], color: Tuple[int, int, int]):
+    """Crée une Surface servant de sprite placeholder.
+    label: texte affiché centré (ex: 'PLAYER', 'PLAT').
+    size: (w, h) en pixels.
+    color: (r,g,b).
+    Retourne: pygame.Surface
+    """
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    surf.fill(color)
+    try:
+        text = FONTS.render(label, max(12, size[1] // 3), (255, 255, 255))
+        tr = text.get_rect(center=(size[0] // 2, size[1] // 2))
+        surf.blit(text, tr)
+    except Exception:
+        # Dans des environnements sans font, on ignore le texte
+        pass
+    return surf
+
+# ---- Texte: polices partagées et HUD --------------------------------------
+class FontCache:
+    """Polices et textes rendus, partagés.
+
+    get(size) crée chaque Font une seule fois; render() garde les derniers
+    textes rendus (LRU de max_texts entrées), utile pour les libellés répétés.
+    Les Surfaces retournées par render() sont partagées: ne pas dessiner dessus.
+    """
+    def __init__(self, max_texts: int = 256):
+        self.max_texts = max_texts
+        self._fonts = {}
+        self._texts = OrderedDict()
+
+    def get(self, size: int, name: Optional[str] = None) -> pygame.font.Font:
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self._fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text: str, size: int, color: Tuple[int, int, int] = (255, 255, 255),
+               name: Optional[str] = None) -> pygame.Surface:
+        key = (text, size, tuple(color), name)
+        surf = self._texts.get(key)
+        if surf is not None:
+            self._texts.move_to_end(key)
+            return surf
+        surf = self._texts[key] = self.get(size, name).render(text, True, color)
+        if len(self._texts) > self.max_texts:
+            self._texts.popitem(last=False)
+        return surf
+
+FONTS = FontCache()  # cache partagé (make_placeholder_sprite, HudText)
+
+class HudText:
+    """Texte d'interface (score...) qui n'est re-rendu que si sa valeur change.
+
+      score = HudText("Score: {}", (10, 10))
+      score.set(world.score)   # ne fait rien si la valeur est la même
+      score.draw(screen)
+    """
+    def __init__(self, fmt: str, pos: Tuple[int, int], size: int = 36,
+                 color: Tuple[int, int, int] = (0, 0, 0), font_name: Optional[str] = None):
+        self.fmt = fmt
+        self.pos = pos
+        self.color = color
+        self.font = FONTS.get(size, font_name)
+        self._value = object()  # aucune valeur rendue pour l'instant
+        self.surface = None
+
+    def set(self, value) -> bool:
+        """Met à jour la valeur affichée. Retourne True si le texte a été re-rendu."""
+        if value == self._value:
+            return False
+        self._value = value
+        self.surface = self.font.render(self.fmt.format(value), True, self.color)
+        return True
+
+    def rect(self) -> Rect:
+        return self.surface.get_rect(topleft=self.pos)
+
+    def draw(self, surface: pygame.Surface) -> Rect:
+        return surface.blit(self.surface, self.pos)
+
+# ---- Cache d'assets et atlas de textures ---------------------------------
+class TextureAtlas:
+    """Grande Surface dans laquelle on range de petites textures (rangement en étagères).
+
+    add() copie une texture dans l'atlas et retourne une subsurface qui la
+    partage: tous les sprites utilisent alors la même Surface en mémoire.
+
+      atlas = TextureAtlas(512, 512)
+      sub = atlas.add(image)   # None si l'atlas est plein
+    """
+    def __init__(self, width: int, height: int, padding: int = 1):
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.padding = padding
+        self._x = 0        # curseur dans l'étagère courante
+        self._y = 0        # haut de l'étagère courante
+        self._shelf_h = 0
+
+    def add(self, image: pygame.Surface) -> Optional[pygame.Surface]:
+        w, h = image.get_size()
+        aw, ah = self.surface.get_size()
+        pad = self.padding
+        if self._x + w > aw:
+            # étagère pleine: on passe à la suivante
+            self._x = 0
+            self._y += self._shelf_h + pad
+            self._shelf_h = 0
+        if w > aw or self._y + h > ah:
+            return None
+        pos = (self._x, self._y)
+        # BLEND_RGBA_MAX sur une zone vide = copie exacte, alpha compris
+        self.surface.blit(image, pos, special_flags=pygame.BLEND_RGBA_MAX)
+        self._x += w + pad
+        self._shelf_h = max(self._shelf_h, h)
+        return self.surface.subsurface(Rect(pos, (w, h)))
+
+class AssetCache:
+    """Cache des images du jeu.
+
+    - chaque fichier n'est lu et décodé qu'une fois (source partagée);
+    - chaque (nom, taille) n'est redimensionné qu'une fois;
+    - max_entries: nombre max d'images redimensionnées gardées (LRU), None = illimité;
+    - atlas_size=(w, h): les images dont les deux côtés font au plus atlas_max_item
+      pixels sont rangées dans des TextureAtlas et servies en subsurfaces.
+      Elles restent en cache hors LRU (et hors max_entries): les oublier ne
+      libérerait pas leur place dans l'atlas, et les redemander les y rangerait
+      une deuxième fois.
+
+    Les Surfaces retournées sont partagées: ne pas dessiner dessus.
+
+      assets = AssetCache()
+      pipe = assets.image("pipe.png", (64, 64))
+      ground = assets.tile("ground.png", TILE * 69, TILE * 2, size=(TILE, TILE))
+      assets.drop_sources()   # après le chargement du niveau
+    """
+    def __init__(self, asset_dir: str = ASSET_DIR, max_entries: Optional[int] = None,
+                 atlas_size: Optional[Tuple[int, int]] = None, atlas_max_item: int = 128):
+        self.asset_dir = asset_dir
+        self.max_entries = max_entries
+        self.atlas_size = atlas_size
+        self.atlas_max_item = atlas_max_item
+        self.atlases = []
+        self._sources = {}             # nom -> Surface décodée
+        self._images = OrderedDict()   # (nom, taille) -> Surface, ordre LRU
+        self._packed = {}              # (nom, taille) -> subsurface d'un atlas (jamais évincée)
+
+    def source(self, name: str) -> pygame.Surface:
+        """Image décodée à sa taille d'origine."""
+        image = self._sources.get(name)
+        if image is None:
+            image = pygame.image.load(os.path.join(self.asset_dir, name))
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()  # sans fenêtre (mode headless), on garde le format chargé
+            self._sources[name] = image
+        return image
+
+    def _remember(self, key, image: pygame.Surface) -> pygame.Surface:
+        self._images[key] = image
+        if self.max_entries is not None:
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+        return image
+
+    def image(self, name: str, size: Optional[Tuple[int, int]] = None) -> pygame.Surface:
+        key = (name, tuple(size) if size else None)
+        image = self._packed.get(key)
+        if image is not None:
+            return image
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        image = self.source(name)
+        if size:
+            image = pygame.transform.scale(image, size)
+        packed = self._pack(image)
+        if packed is not image:
+            self._packed[key] = packed
+            return packed
+        return self._remember(key, image)
+
+    def tile(self, name: str, width: int, height: int, size: Optional[Tuple[int, int]] = None) -> pygame.Surface:
+        """tile_image() de la texture name (à la taille size), mis en cache."""
+        key = (name, tuple(size) if size else None, (width, height))
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        return self._remember(key, tile_image(self.image(name, size), width, height))
+
+    def _pack(self, image: pygame.Surface) -> pygame.Surface:
+        if self.atlas_size is None:
+            return image
+        w, h = image.get_size()
+        if w > self.atlas_max_item or h > self.atlas_max_item:
+            return image
+        if self.atlases:
+            sub = self.atlases[-1].add(image)
+            if sub is not None:
+                return sub
+        atlas = TextureAtlas(*self.atlas_size)
+        if pygame.display.get_surface() is not None:
+            atlas.surface = atlas.surface.convert_alpha()
+        self.atlases.append(atlas)
+        return atlas.add(image) or image
+
+    def drop_sources(self):
+        """Libère les images d'origine (les versions redimensionnées restent en cache)."""
+        self._sources.clear()
+
+    def evict(self, name: Optional[str] = None):
+        """Oublie toutes les images (ou seulement celles de name).
+        La place occupée dans les atlas n'est pas récupérée.
+        """
+        if name is None:
+            self._images.clear()
+            self._packed.clear()
+            self._sources.clear()
+            return
+        for key in [k for k in self._images if k[0] == name]:
+            del self._images[key]
+        for key in [k for k in self._packed if k[0] == name]:
+            del self._packed[key]
+        self._sources.pop(name, None)
+
+ASSETS = AssetCache()  # cache partagé utilisé par load_image()
+
+# ---- Index spatial (broadphase) -------------------------------------------
+class SpatialHash:
+    """Grille uniforme qui range des objets par cellules de `cell` pixels.
+
+    Chaque objet est inscrit dans toutes les cellules couvertes par son rect:
+    une requête ne parcourt que les cellules touchées par la zone demandée,
+    donc son coût dépend du voisinage et non de la taille du niveau.
+
+      grid = SpatialHash(TILE)
+      grid.insert(obj, obj.rect)
+      grid.update(obj, obj.rect)   # après un déplacement
+      grid.query(Rect(...))        # -> liste de candidats (ordre d'insertion)
+    """
+    def __init__(self, cell: int = TILE):
+        self.cell = cell
+        self.cells = {}   # (cx, cy) -> {obj: None} (dict: ordre déterministe)
+        self._spans = {}  # obj -> (cx0, cy0, cx1, cy1)
+
+    def _span(self, rect: Rect):
+        c = self.cell
+        return (rect.left // c, rect.top // c,
+                max(rect.right - 1, rect.left) // c, max(rect.bottom - 1, rect.top) // c)
+
+    def _link(self, obj, span):
+        cells = self.cells
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = {}
+                bucket[obj] = None
+
+    def _unlink(self, obj, span):
+        cells = self.cells
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(obj, None)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def insert(self, obj, rect: Rect):
+        if obj in self._spans:
+            self.update(obj, rect)
+            return
+        span = self._span(rect)
+        self._spans[obj] = span
+        self._link(obj, span)
+
+    def remove(self, obj):
+        span = self._spans.pop(obj, None)
+        if span is not None:
+            self._unlink(obj, span)
+
+    def update(self, obj, rect: Rect) -> bool:
+        """Réindexe obj si son rect a changé de cellules. Retourne True si c'est le cas."""
+        old = self._spans.get(obj)
+        span = self._span(rect)
+        if span == old:
+            return False
+        if old is not None:
+            self._unlink(obj, old)
+        self._spans[obj] = span
+        self._link(obj, span)
+        return True
+
+    def query(self, rect: Rect) -> list:
+        """Objets inscrits dans les cellules couvertes par rect (sans test AABB exact)."""
+        cx0, cy0, cx1, cy1 = self._span(rect)
+        cells = self.cells
+        found = {}
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return list(found)
+
+    def __len__(self):
+        return len(self._spans)
+
+class SpatialGroup(pygame.sprite.Group):
+    """Group pygame doublé d'un SpatialHash, tenu à jour automatiquement.
+
+    add()/remove()/kill() mettent l'index à jour; les GameObject qui se déplacent
+    appellent moved() pour être réindexés. Les requêtes remplacent
+    pygame.sprite.spritecollide / spritecollideany:
+
+      platforms = SpatialGroup(cell=TILE)
+      hits = platforms.collide(player)          # comme spritecollide
+      enemy = enemies.collideany(player)        # comme spritecollideany
+      near = coins.query(Rect(...))             # sprites qui touchent la zone
+    """
+    def __init__(self, *sprites, cell: int = TILE):
+        self.index = SpatialHash(cell)
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        self.index.insert(sprite, sprite.rect)
+        indexes = getattr(sprite, '_indexes', None)
+        if indexes is not None and self not in indexes:
+            indexes.append(self)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.index.remove(sprite)
+        indexes = getattr(sprite, '_indexes', None)
+        if indexes is not None and self in indexes:
+            indexes.remove(self)
+
+    def relocate(self, sprite):
+        """Réindexe un sprite après un déplacement (appelé par GameObject.moved())."""
+        self.index.update(sprite, sprite.rect)
+
+    def query(self, rect: Rect, count: bool = False) -> list:
+        """Sprites qui touchent rect.
+        count=True: les tests sont comptés dans 'collision_tests' du Profiler
+        (chemins de collision; pas le culling de la caméra ni les régions d'activité).
+        """
+        candidates = self.index.query(rect)
+        if count and PROFILER is not None:
+            PROFILER.count('collision_tests', len(candidates))
+        return [s for s in candidates if s.rect.colliderect(rect)]
+
+    def collide(self, sprite, dokill: bool = False) -> list:
+        hits = self.query(sprite.rect, count=True)
+        if dokill:
+            for s in hits:
+                s.kill()
+        return hits
+
+    def collideany(self, sprite):
+        rect = sprite.rect
+        candidates = self.index.query(rect)
+        if PROFILER is not None:
+            PROFILER.count('collision_tests', len(candidates))
+        for s in candidates:
+            if s.rect.colliderect(rect):
+                return s
+        return None
+
+# ---- Base: GameObject -----------------------------------------------------
+class GameObject(pygame.sprite.Sprite):
+    """Base pour tous les objets du jeu.
+
+    Propriétés importantes:
+      - self.x, self.y: position (coin haut-gauche) en pixels, flottants
+      - self.rect: Rect entier dérivé de x, y (collisions et dessin)
+      - self.vx, self.vy: vitesses en pixels/sec
+      - self.solid: si True, participe aux collisions de plateforme
+      - self.static: si True, l'objet ne bouge ni ne change jamais d'image
+        (CameraGroup peut alors le pré-rendre, voir bake_static)
+
+    NOTE: les collisions se font par test AABB via rect.
+    Pour déplacer un objet, modifier x/y puis appeler sync_rect(), ou utiliser
+    place(x, y): une écriture directe dans rect serait écrasée au pas suivant.
+    """
+    def __init__(self, x: float, y: float, image: pygame.Surface):
+        super().__init__()
+        self.image = image
+        self.x = float(x)
+        self.y = float(y)
+        self.rect = self.image.get_rect(topleft=(round(self.x), round(self.y)))
+        self.vx = 0.0
+        self.vy = 0.0
+        self.solid = True
+        self.static = False
+        self.prev_pos = (self.x, self.y)  # position au pas précédent (interpolation)
+        self._indexes = []  # SpatialGroup qui indexent cet objet (voir moved())
+
+    def update(self, dt: float, world: Optional[dict] = None):
+        """Mettre à jour l'objet.
+        dt: delta-time en secondes.
+        world: dictionnaire facultatif contenant des groupes/infos (ex: {'platforms': Group})
+        """
+        # Mouvement basique
+        if self.vx or self.vy:
+            self.x += self.vx * dt
+            self.y += self.vy * dt
+            self.sync_rect()
+
+    def sync_rect(self):
+        """Recopie x, y dans rect (arrondi au pixel) et réindexe l'objet s'il a bougé."""
+        rect = self.rect
+        x = round(self.x)
+        y = round(self.y)
+        if x != rect.x or y != rect.y:
+            rect.x = x
+            rect.y = y
+            self.moved()
+
+    def place(self, x: float, y: float):
+        """Téléporte l'objet en (x, y) (coin haut-gauche)."""
+        self.x = float(x)
+        self.y = float(y)
+        self.prev_pos = (self.x, self.y)
+        self.sync_rect()
+
+    def moved(self):
+        """Signale que self.rect a changé: réindexe l'objet dans ses SpatialGroup.
+        Appelé par sync_rect(); à appeler soi-même après avoir modifié rect à la main.
+        """
+        for group in self._indexes:
+            group.relocate(self)
+
+    def catch_up(self, elapsed: float):
+        """Rattrape elapsed secondes passées endormi (voir World(active_radius=...)).
+        Par défaut l'objet reste figé; les sous-classes au mouvement prévisible
+        calculent directement leur nouvelle position.
+        """
+
+    def render_pos(self, alpha: float) -> Tuple[int, int]:
+        """Position interpolée entre prev_pos (alpha=0) et (x, y) (alpha=1)."""
+        px, py = self.prev_pos
+        return (round(px + (self.x - px) * alpha), round(py + (self.y - py) * alpha))
+
+# ---- Plateformes ---------------------------------------------------------
+class Platform(GameObject):
+    """Plateforme statique simple.
+
+    Constructeur:
+        Platform(x, y, w, h, color=(100,100,100))
+    """
+    def __init__(self, x: float, y: float, w: int, h: int, color: Tuple[int, int, int] = (100,100,100), image = None):
+        if image:
+            img = image
+        else:
+            img = make_placeholder_sprite('PLAT', (w, h), color)
+        super().__init__(x, y, img)
+        self.solid = True
+        self.static = True
+
+class OneWayPlatform(Platform):
+    """Plateforme marchable uniquement quand le joueur tombe dessus (one-way).
+    La logique d'acceptation du contact doit être gérée depuis la détection de collisions
+    du Player (voir méthodes utilitaires dans Player).
+    """
+    def __init__(self, x, y, w, h, color=(120, 90, 60), image=None):
+        super().__init__(x, y, w, h, color, image)
+        self.type = 'oneway'
+
+class MovingPlatform(Platform):
+    """Plateforme se déplaçant entre deux points.
+
+    args: path=((x1,y1),(x2,y2)), speed pixels/sec, loop True/False
+    """
+    def __init__(self, x, y, w, h, path: Tuple[Tuple[int,int], Tuple[int,int]], speed: float=100.0, color=(80,120,200), image=None):
+        super().__init__(x, y, w, h, color, image)
+        self.path = [(float(px), float(py)) for px, py in path]
+        self.speed = speed
+        self._target = 1
+        self.solid = True
+        self.static = False
+
+    def update(self, dt: float, world: Optional[dict] = None):
+        if len(self.path) < 2:
+            return
+        tx, ty = self.path[self._target]
+        dx = tx - self.x
+        dy = ty - self.y
+        dist = math.hypot(dx, dy)
+        if dist < 1e-6:
+            # switch
+            self._target = (self._target + 1) % len(self.path)
+            return
+        step = self.speed * dt
+        if step >= dist:
+            self.x, self.y = tx, ty
+            self._target = (self._target + 1) % len(self.path)
+        else:
+            self.x += dx / dist * step
+            self.y += dy / dist * step
+        self.sync_rect()
+
+    def catch_up(self, elapsed: float):
+        n = len(self.path)
+        loop = sum(math.dist(self.path[i], self.path[(i + 1) % n]) for i in range(n)) if n > 1 else 0.0
+        if loop < 1e-6 or self.speed <= 0:
+            return
+        dist = self.speed * elapsed
+        while dist > 0:
+            tx, ty = self.path[self._target]
+            dx = tx - self.x
+            dy = ty - self.y
+            seg = math.hypot(dx, dy)
+            if dist < seg:
+                self.x += dx / seg * dist
+                self.y += dy / seg * dist
+                break
+            dist -= seg
+            self.x, self.y = tx, ty
+            self._target = (self._target + 1) % n
+            dist %= loop  # tours complets inutiles
+        self.sync_rect()
+
+# ---- Collectibles -------------------------------------------------------
+class Coin(GameObject):
+    """Pièce ramassable. Quand on appelle collect(), elle s'enlève du groupe.
+
+    coin.collect() -> return valeur (int)
+    """
+    def __init__(self, x, y, value: int = 1, image = None):
+        if image:
+            img = image
+        else:
+            img = make_placeholder_sprite('COIN', (TILE//2, TILE//2), (220,180,0))
+        super().__init__(x, y, img)
+        self.value = value
+        self.solid = False
+
+    def collect(self):
+        # Par défaut retourne la valeur et kill() l'objet pour être retiré des groupes
+        try:
+            self.kill()
+        except Exception:
+            pass
+        return self.value
+
+# ---- Ennemi simple ------------------------------------------------------
+class Enemy(GameObject):
+    """Ennemi patrouillant horizontalement entre deux bornes.
+
+    enemy = Enemy(x, y, w, h, patrol=(x1,x2), speed)
+    """
+    def __init__(self, x, y, w: int, h: int, patrol: Tuple[int,int], speed: float = 60.0, color=(200,50,50), image=None):
+        if image:
+            img = image
+        else:
+            img = make_placeholder_sprite('ENEMY', (w, h), color)
+        super().__init__(x, y, img)
+        self.patrol = patrol
+        self.speed = speed
+        self.direction = 1
+        self.vx = speed
+        self.solid = True
+
+    @property
+    def patrol(self) -> Tuple[int, int]:
+        return self._patrol
+
+    @patrol.setter
+    def patrol(self, bounds: Tuple[int, int]):
+        self._patrol = bounds
+        self.patrol_min = min(bounds)
+        self.patrol_max = max(bounds)
+
+    def update(self, dt: float, world: Optional[dict] = None):
+        x = self.x + self.vx * dt
+        if x < self.patrol_min:
+            x = self.patrol_min
+            self.vx = abs(self.speed)
+        elif x > self.patrol_max:
+            x = self.patrol_max
+            self.vx = -abs(self.speed)
+        self.x = x
+        self.sync_rect()
+
+    def catch_up(self, elapsed: float):
+        # Aller-retour "déplié": position sur un cycle de longueur 2 * (max - min)
+        lo, hi = self.patrol_min, self.patrol_max
+        span = hi - lo
+        if span <= 0 or not self.vx:
+            return
+        x = min(max(self.x, lo), hi)
+        s = x - lo if self.vx > 0 else 2 * span - (x - lo)
+        s = (s + abs(self.vx) * elapsed) % (2 * span)
+        if s <= span:
+            self.x = lo + s
+            self.vx = abs(self.speed)
+        else:
+            self.x = hi - (s - span)
+            self.vx = -abs(self.speed)
+        self.sync_rect()
+
+# ---- Player -------------------------------------------------------------
+class Player(GameObject):
+    """Classe Player avec physiques simples (accélération, saut, collisions AABB).
+
+    Contrôles attendus par défaut: gauche/droite/jump (à gérer côté jeu).
+
+    Méthodes importantes:
+      - apply_input(left_bool, right_bool, jump_pressed_bool, jump_held_bool, dt)
+      - resolve_collisions(platforms_group)
+
+    swept=True: collisions continues (voir _resolve_swept), sans traversée des
+    plateformes fines même à grande vitesse ou avec un grand dt; permet de faire
+    tourner la physique à une fréquence plus basse. Suppose que prev_pos des
+    plateformes mobiles vaut leur position au début du pas (c'est le cas dans World).
+
+    Le jeu appelant doit gérer l'input et fournir les groupes de plateformes/coins/enemies.
+    """
+    def __init__(self, x: float, y: float, w: int = TILE, h: int = TILE*2, color: Tuple[int,int,int]=(50,150,50), image = None):
+        if image:
+            img = image
+        else:
+            img = make_placeholder_sprite('PLAYER', (w, h), color)
+        super().__init__(x, y, img)
+        # Movement
+        self.speed = 1200.0  # pixels/sec horizontal max
+        self.accel = 6000.0  # pixels/sec^2
+        self.friction = 6000.0
+        self.jump_speed = 1200.0
+        self.can_double_jump = False
+        self.jumps_left = 1
+        # State
+        self.on_ground = False
+        self.solid = True
+        # Collisions
+        self.swept = False
+        self.move_from = (self.x, self.y)  # position avant apply_input (mode swept)
+        self.riding = None                 # plateforme sous les pieds (mode swept)
+
+    def apply_input(self, left: bool, right: bool, jump_pressed: bool, jump_held: bool, dt: float):
+        # Horizontal accel
+        desired_vx = 0
+        if left and not right:
+            desired_vx = -self.speed
+        elif right and not left:
+            desired_vx = self.speed
+        # Simple approach: accelerate towards desired_vx
+        if self.vx < desired_vx:
+            self.vx = min(desired_vx, self.vx + self.accel * dt)
+        elif self.vx > desired_vx:
+            self.vx = max(desired_vx, self.vx - self.accel * dt)
+
+        # Gravity
+        self.vy += GRAVITY * dt
+        if self.vy > TERMINAL_V:
+            self.vy = TERMINAL_V
+
+        # Jump
+        if jump_pressed:
+            if self.on_ground or self.jumps_left > 0:
+                self.vy = -self.jump_speed
+                if not self.on_ground:
+                    self.jumps_left -= 1
+                self.on_ground = False
+
+        # Variable jump height: if jump released while moving up, reduce vy
+        if not jump_held and self.vy < 0:
+            self.vy += GRAVITY * 0.4 * dt  # drag upwards
+
+        # Apply movement: seulement la position flottante, rect est mis à jour
+        # axe par axe dans resolve_collisions()
+        self.move_from = (self.x, self.y)
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+
+    def update(self, dt: float, world: Optional[dict] = None):
+        # Le joueur se déplace via apply_input() + resolve_collisions()
+        pass
+
+    def _platform_hits(self, platforms: pygame.sprite.Group, rect: Rect) -> list:
+        # SpatialGroup: seulement les plateformes voisines; sinon test de tout le groupe
+        if isinstance(platforms, SpatialGroup):
+            return platforms.query(rect, count=True)
+        if PROFILER is not None:
+            PROFILER.count('collision_tests', len(platforms))
+        return [p for p in platforms if p.rect.colliderect(rect)]
+
+    def resolve_collisions(self, platforms: pygame.sprite.Group):
+        """Résout les collisions avec les plateformes, proprement et sans glitchs.
+        Applique le déplacement calculé par apply_input() axe par axe.
+        platforms peut être un SpatialGroup (recommandé pour les grands niveaux).
+        """
+        if self.swept:
+            return self._resolve_swept(platforms)
+        rect = self.rect
+        # --- Mouvement horizontal ---
+        rect.x = round(self.x)
+        for p in self._platform_hits(platforms, rect):
+            if not p.solid:
+                continue
+            # Collision droite
+            if self.vx > 0 and rect.right > p.rect.left:
+                rect.right = p.rect.left
+                self.x = rect.x
+                self.vx = 0
+            # Collision gauche
+            elif self.vx < 0 and rect.left < p.rect.right:
+                rect.left = p.rect.right
+                self.x = rect.x
+                self.vx = 0
+
+        # --- Mouvement vertical ---
+        prev_bottom = rect.bottom
+        rect.y = round(self.y)
+        self.on_ground = False
+        for p in self._platform_hits(platforms, rect):
+            if not p.solid:
+                continue
+
+            # Cas spécial : plateformes one-way (marchables que du dessus)
+            if getattr(p, "type", None) == "oneway":
+                # On ne bloque que si on descend et qu'on arrive d'au-dessus
+                if self.vy <= 0:
+                    continue
+                if prev_bottom > p.rect.top:
+                    continue
+
+            # Si on tombe et qu'on touche le haut de la plateforme
+            if self.vy > 0 and rect.bottom > p.rect.top and rect.top < p.rect.top:
+                rect.bottom = p.rect.top
+                self.y = rect.y
+                self._land()
+            # Si on monte et qu'on touche un plafond
+            elif self.vy < 0 and rect.top < p.rect.bottom and rect.bottom > p.rect.bottom:
+                rect.top = p.rect.bottom
+                self.y = rect.y
+                self.vy = 0
+
+        # Posé au pixel près: un petit pas de chute (< 0.5 px) n'entre pas dans
+        # la plateforme, on regarde donc juste en dessous des pieds
+        if not self.on_ground and self.vy >= 0:
+            feet = Rect(rect.left, rect.bottom, rect.width, 1)
+            for p in self._platform_hits(platforms, feet):
+                if p.solid and p.rect.top == rect.bottom:
+                    self.y = rect.y
+                    self._land()
+                    break
+        self.moved()
+
+    def _land(self):
+        self.vy = 0
+        self.on_ground = True
+        self.jumps_left = 1
+
+    @staticmethod
+    def _slab(pos, size, d, lo, hi):
+        """Instants (entrée, sortie) où [pos, pos+size] se déplaçant de d recouvre [lo, hi]."""
+        if d > 0:
+            return (lo - pos - size) / d, (hi - pos) / d
+        if d < 0:
+            return (hi - pos) / d, (lo - pos - size) / d
+        if pos < hi and pos + size > lo:
+            return -math.inf, math.inf
+        return math.inf, -math.inf
+
+    def _resolve_swept(self, platforms: pygame.sprite.Group):
+        """Collisions continues (swept AABB) pour le déplacement move_from -> (x, y).
+
+        Pour chaque plateforme candidate, on calcule l'instant d'impact du
+        mouvement RELATIF (joueur moins plateforme, qui a bougé de prev_pos à
+        x, y pendant le pas); on avance jusqu'au premier impact, on annule la
+        vitesse sur l'axe touché et on glisse avec le reste du mouvement (3
+        impacts max par pas). Sur une plateforme mobile, le joueur qui y est
+        posé est emporté par son déplacement; les one-way ne bloquent qu'un
+        impact par le haut.
+        """
+        rect = self.rect
+        w, h = rect.size
+        x, y = self.move_from
+        dx, dy = self.x - x, self.y - y
+        ride = self.riding
+        if ride is not None and ride.alive():
+            dx += ride.x - ride.prev_pos[0]
+            dy += ride.y - ride.prev_pos[1]
+        # Candidats: tout ce qui touche la zone balayée (marge pour les plateformes mobiles)
+        area = Rect(math.floor(min(x, x + dx)), math.floor(min(y, y + dy)),
+                    math.ceil(abs(dx)) + w + 1, math.ceil(abs(dy)) + h + 1).inflate(TILE, TILE)
+        cands = []
+        for p in self._platform_hits(platforms, area):
+            if p.solid:
+                px, py = p.prev_pos
+                cands.append((p, px, py, p.x - px, p.y - py, p.rect.width, p.rect.height,
+                              getattr(p, "type", None) == "oneway"))
+
+        self.on_ground = False
+        self.riding = None
+        t0 = 0.0  # fraction du pas déjà parcourue
+        for _ in range(3):
+            left = 1.0 - t0
+            best = None
+            for p, px, py, pdx, pdy, pw, ph, oneway in cands:
+                # Position de la plateforme à t0, mouvement relatif sur le reste du pas
+                qx = px + pdx * t0
+                qy = py + pdy * t0
+                rdx = dx - pdx * left
+                rdy = dy - pdy * left
+                tx0, tx1 = self._slab(x, w, rdx, qx, qx + pw)
+                ty0, ty1 = self._slab(y, h, rdy, qy, qy + ph)
+                t_in = max(tx0, ty0)
+                if t_in >= min(tx1, ty1) or t_in > 1:
+                    continue  # pas d'impact pendant ce pas
+                axis = 'y' if ty0 >= tx0 else 'x'
+                if t_in < 0:
+                    # Déjà dedans au départ: on ne tolère que les erreurs d'arrondi (contact)
+                    if -t_in * abs(rdy if axis == 'y' else rdx) > 0.01:
+                        continue
+                    t_in = 0.0
+                if oneway and (axis != 'y' or rdy <= 0):
+                    continue
+                if best is None or t_in < best[0]:
+                    best = (t_in, axis, p, rdy)
+            if best is None:
+                x += dx
+                y += dy
+                break
+            t, axis, p, rdy = best
+            x += dx * t
+            y += dy * t
+            t0 += left * t
+            rest = 1.0 - t
+            # Sur l'axe touché, le joueur suit la plateforme jusqu'à la fin du pas
+            if axis == 'x':
+                dx = (p.x - p.prev_pos[0]) * (1.0 - t0)
+                dy *= rest
+                self.vx = 0
+            else:
+                dx *= rest
+                dy = (p.y - p.prev_pos[1]) * (1.0 - t0)
+                if rdy > 0:
+                    self._land()
+                    self.riding = p
+                elif self.vy < 0:
+                    self.vy = 0
+
+        self.x, self.y = x, y
+        if self.riding is not None:
+            self.y = self.riding.y - h  # pile sur la plateforme, sans dérive d'arrondi
+        rect.x = round(self.x)
+        rect.y = round(self.y)
+        self.moved()
+
+# ---- Camera / Drawing helpers -------------------------------------------
+class CameraGroup(SpatialGroup):
+    """Groupe de sprites qui applique un offset (camera) lors du dessin.
+
+    Seuls les sprites qui touchent la zone visible sont dessinés (requête dans
+    l'index spatial, cellules de `cell` pixels), en un seul appel Surface.blits.
+    L'ordre de dessin (par rect.bottom) est conservé d'une frame à l'autre et
+    n'est retrié que si un sprite visible a bougé verticalement ou si
+    l'ensemble visible a changé.
+
+    bake_static=True: les sprites `static` (Platform, OneWayPlatform) ne sont
+    plus dessinés un par un mais pré-rendus dans des morceaux (chunks) de
+    chunk_size x chunk_size pixels, construits à la première apparition à
+    l'écran et gardés dans un cache LRU de max_chunks surfaces. Les sprites
+    dynamiques (Player, Enemy, MovingPlatform, Coin) sont dessinés par-dessus
+    cette couche. Les chunks sont opaques, remplis avec `background` (la
+    couleur dont l'appelant remplit l'écran): une copie sans mélange alpha.
+    Un chunk sans aucun sprite statique n'est pas dessiné du tout.
+
+    dirty=True: draw() ne redessine que ce qui a changé (sprites déplacés,
+    défilement de la caméra) sur un fond uni `background` et retourne la liste
+    des Rect à passer à pygame.display.update() au lieu de flip().
+
+    Utilisation:
+      cam = CameraGroup(width, height)
+      cam.add(sprites...)
+      cam.set_center(x, y)
+      cam.draw(surface)
+    """
+    def __init__(self, screen_w: int, screen_h: int, cell: int = TILE * 8,
+                 bake_static: bool = False, chunk_size: int = 512, max_chunks: int = 24,
+                 dirty: bool = False, background: Tuple[int, int, int] = (0, 0, 0)):
+        self.dirty = dirty
+        self.background = background
+        self._last_offset = None    # mode dirty: offset caméra de la frame précédente
+        self._drawn = {}            # mode dirty: (image, position) -> Rect écran dessinés
+        self._last_overlays = []
+        self.bake_static = bake_static
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self._static = SpatialHash(chunk_size)  # sprites pré-rendus
+        self._static_rects = {}                 # sprite -> rect lors du rendu
+        self._chunks = OrderedDict()            # (cx, cy) -> Surface (None: vide), ordre LRU
+        super().__init__(cell=cell)
+        self.screen_w = screen_w
+        self.screen_h = screen_h
+        self.camera_pos = pygame.math.Vector2(0, 0)
+        self._zorder = []      # sprites visibles à la dernière frame, triés
+        self._zset = set()
+        self._zdirty = True
+        self._bottoms = {}     # sprite -> rect.bottom lors du dernier tri
+        self._seq = {}         # sprite -> rang d'ajout (départage les égalités)
+        self._next_seq = 0
+
+    def _is_baked(self, sprite) -> bool:
+        return self.bake_static and getattr(sprite, 'static', False)
+
+    def add_internal(self, sprite, layer=None):
+        self._seq[sprite] = self._next_seq
+        self._next_seq += 1
+        if self._is_baked(sprite):
+            pygame.sprite.Group.add_internal(self, sprite)
+            self._static.insert(sprite, sprite.rect)
+            self._static_rects[sprite] = sprite.rect.copy()
+            self._invalidate_chunks(sprite.rect)
+            indexes = getattr(sprite, '_indexes', None)
+            if indexes is not None and self not in indexes:
+                indexes.append(self)
+            return
+        super().add_internal(sprite)
+        self._bottoms[sprite] = sprite.rect.bottom
+        self._zdirty = True
+
+    def remove_internal(self, sprite):
+        self._seq.pop(sprite, None)
+        old = self._static_rects.pop(sprite, None)
+        if old is not None:
+            pygame.sprite.Group.remove_internal(self, sprite)
+            self._static.remove(sprite)
+            self._invalidate_chunks(old)
+            indexes = getattr(sprite, '_indexes', None)
+            if indexes is not None and self in indexes:
+                indexes.remove(self)
+            return
+        super().remove_internal(sprite)
+        self._bottoms.pop(sprite, None)
+        self._zdirty = True
+
+    def relocate(self, sprite):
+        old = self._static_rects.get(sprite)
+        if old is not None:
+            if old == sprite.rect:
+                return
+            # Un sprite "static" déplacé à la main: on refait les chunks touchés
+            self._invalidate_chunks(old)
+            self._invalidate_chunks(sprite.rect)
+            self._static.update(sprite, sprite.rect)
+            self._static_rects[sprite] = sprite.rect.copy()
+            return
+        super().relocate(sprite)
+        bottom = sprite.rect.bottom
+        if self._bottoms.get(sprite) != bottom:
+            self._bottoms[sprite] = bottom
+            self._zdirty = True
+
+    def set_center(self, x: float, y: float):
+        # centre la caméra autour de x,y
+        self.camera_pos.x = x - self.screen_w // 2
+        self.camera_pos.y = y - self.screen_h // 2
+
+    def viewport(self) -> Rect:
+        """Zone du monde visible à l'écran."""
+        return Rect(int(self.camera_pos.x), int(self.camera_pos.y), self.screen_w, self.screen_h)
+
+    def visible_sprites(self) -> list:
+        """Sprites qui touchent la zone visible, dans l'ordre de dessin."""
+        # Marge d'une tile: avec l'interpolation, un sprite est dessiné un peu
+        # en retrait de son rect
+        visible = self.query(self.viewport().inflate(TILE * 2, TILE * 2))
+        if self._zdirty or len(visible) != len(self._zset) or not self._zset.issuperset(visible):
+            # Répare l'ordre précédent: les survivants sont déjà triés, le tri
+            # (Timsort) est donc quasi linéaire sur le nombre de sprites visibles.
+            vset = set(visible)
+            order = [s for s in self._zorder if s in vset]
+            kept = set(order)
+            order.extend(s for s in visible if s not in kept)
+            seq = self._seq
+            order.sort(key=lambda s: (s.rect.bottom, seq[s]))
+            self._zorder = order
+            self._zset = vset
+            self._zdirty = False
+        return self._zorder
+
+    # -- Couche statique pré-rendue --
+    def _invalidate_chunks(self, rect: Rect):
+        if not self._chunks:
+            return
+        c = self.chunk_size
+        for cx in range(rect.left // c, (rect.right - 1) // c + 1):
+            for cy in range(rect.top // c, (rect.bottom - 1) // c + 1):
+                self._chunks.pop((cx, cy), None)
+
+    def _build_chunk(self, cx: int, cy: int) -> Optional[pygame.Surface]:
+        c = self.chunk_size
+        area = Rect(cx * c, cy * c, c, c)
+        seq = self._seq
+        sprites = [s for s in self._static.query(area) if s.rect.colliderect(area)]
+        if not sprites:
+            return None
+        sprites.sort(key=lambda s: (s.rect.bottom, seq[s]))
+        # Opaque, sur la couleur de fond: bien plus rapide à copier qu'une surface SRCALPHA
+        surf = pygame.Surface((c, c))
+        surf.fill(self.background)
+        surf.blits([(s.image, (s.rect.x - area.x, s.rect.y - area.y)) for s in sprites], False)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        return surf
+
+    def visible_chunks(self) -> list:
+        """(surface, position monde) des chunks statiques visibles, construits au besoin."""
+        view = self.viewport()
+        c = self.chunk_size
+        chunks = self._chunks
+        out = []
+        visible = 0
+        for cy in range(view.top // c, (view.bottom - 1) // c + 1):
+            for cx in range(view.left // c, (view.right - 1) // c + 1):
+                visible += 1
+                key = (cx, cy)
+                if key in chunks:
+                    surf = chunks[key]
+                    chunks.move_to_end(key)
+                else:
+                    surf = chunks[key] = self._build_chunk(cx, cy)
+                if surf is not None:
+                    out.append((surf, (cx * c, cy * c)))
+        # Éviction LRU: les chunks visibles viennent d'être remis en fin de file
+        while len(chunks) > max(self.max_chunks, visible):
+            chunks.popitem(last=False)
+        return out
+
+    def _blit_list(self, alpha: Optional[float]) -> list:
+        """(image, position écran) des chunks puis des sprites visibles, dans l'ordre de dessin."""
+        ox = int(self.camera_pos.x)
+        oy = int(self.camera_pos.y)
+        chunks = self.visible_chunks() if self.bake_static and self._static else ()
+        blits = [(surf, (x - ox, y - oy)) for surf, (x, y) in chunks]
+        sprites = self.visible_sprites()
+        if PROFILER is not None:
+            PROFILER.count('sprites_drawn', len(sprites))
+        if alpha is None:
+            blits += [(spr.image, (spr.rect.x - ox, spr.rect.y - oy)) for spr in sprites]
+            return blits
+        for spr in sprites:
+            if hasattr(spr, 'render_pos'):
+                x, y = spr.render_pos(alpha)
+            else:
+                x, y = spr.rect.topleft
+            blits.append((spr.image, (x - ox, y - oy)))
+        return blits
+
+    def draw(self, surface: pygame.Surface, *args, alpha: Optional[float] = None, **kwargs):
+        """Dessine les sprites visibles avec l'offset camera.
+        alpha: facteur d'interpolation retourné par World.advance(); None = positions exactes.
+        En mode dirty, voir draw_dirty().
+        """
+        if self.dirty:
+            return self.draw_dirty(surface, alpha=alpha, overlays=kwargs.get('overlays', ()))
+        blits = self._blit_list(alpha)
+        if PROFILER is not None:
+            PROFILER.count('blits', len(blits))
+        surface.blits(blits, False)
+
+    # -- Mode "dirty rectangles" --
+    def invalidate(self):
+        """Force un rendu complet à la prochaine frame (ex: fenêtre ré-exposée)."""
+        self._last_offset = None
+
+    def draw_dirty(self, surface: pygame.Surface, alpha: Optional[float] = None, overlays=()) -> list:
+        """Ne redessine que les zones qui ont changé et retourne leurs Rect écran,
+        à passer à pygame.display.update(rects).
+
+        - défilement de la caméra: le contenu de l'écran est décalé avec
+          Surface.scroll() et seules les bandes découvertes sont redessinées;
+        - sprites déplacés, apparus, disparus ou dont l'image a changé: ancienne
+          et nouvelle position.
+        overlays: Rect écran que l'appelant dessine par-dessus après draw (HUD...);
+        le fond y est restauré à chaque frame et ils sont inclus dans le retour.
+
+        Suppose que la surface garde son contenu d'une frame à l'autre (pas de
+        double buffering matériel) et que rien d'autre n'y dessine.
+        """
+        screen = surface.get_rect()
+        offset = (int(self.camera_pos.x), int(self.camera_pos.y))
+        blits = self._blit_list(alpha)
+        drawn = {}
+        for image, pos in blits:
+            drawn[image, pos] = Rect(pos, image.get_size())
+        overlays = [Rect(r) for r in overlays]
+
+        last = self._last_offset
+        dx = dy = 0
+        if last is not None:
+            dx = offset[0] - last[0]
+            dy = offset[1] - last[1]
+        if last is None or abs(dx) >= screen.width or abs(dy) >= screen.height:
+            surface.fill(self.background)
+            surface.blits(blits, False)
+            if PROFILER is not None:
+                PROFILER.count('blits', len(blits))
+            self._last_offset = offset
+            self._drawn = drawn
+            self._last_overlays = overlays
+            return [screen]
+
+        dirty = list(overlays)
+        previous = self._drawn
+        if dx or dy:
+            surface.scroll(-dx, -dy)
+            if dx > 0:
+                dirty.append(Rect(screen.width - dx, 0, dx, screen.height))
+            elif dx < 0:
+                dirty.append(Rect(0, 0, -dx, screen.height))
+            if dy > 0:
+                dirty.append(Rect(0, screen.height - dy, screen.width, dy))
+            elif dy < 0:
+                dirty.append(Rect(0, 0, screen.width, -dy))
+            # Ce qui était à l'écran a suivi le défilement
+            previous = {(image, (x - dx, y - dy)): r.move(-dx, -dy) for (image, (x, y)), r in previous.items()}
+            dirty += [r.move(-dx, -dy) for r in self._last_overlays]
+        dirty += self._last_overlays
+        # Une entrée (image, position) qui n'existe que d'un côté = quelque chose a changé
+        for key, r in drawn.items():
+            if key not in previous:
+                dirty.append(r)
+        for key, r in previous.items():
+            if key not in drawn:
+                dirty.append(r)
+
+        # Regroupe les zones qui se touchent puis les redessine, clip actif
+        merged = []
+        for r in dirty:
+            r = r.clip(screen)
+            if not r.width or not r.height:
+                continue
+            i = r.collidelist(merged)
+            while i != -1:
+                r.union_ip(merged.pop(i))
+                i = r.collidelist(merged)
+            merged.append(r)
+        count = 0
+        for r in merged:
+            surface.set_clip(r)
+            surface.fill(self.background, r)
+            todo = [b for b in blits if r.colliderect(drawn[b[0], b[1]])]
+            surface.blits(todo, False)
+            count += len(todo)
+        surface.set_clip(None)
+        if PROFILER is not None:
+            PROFILER.count('blits', count)
+            PROFILER.count('dirty_rects', len(merged))
+
+        self._last_offset = offset
+        self._drawn = drawn
+        self._last_overlays = overlays
+        return merged
+
+# ---- Mise à jour vectorisée (numpy, optionnel) --------------------------
+class EntityBatch:
+    """Met à jour tous les Enemy et MovingPlatform d'un niveau en un passage numpy.
+
+    Positions, vitesses, bornes de patrouille et chemins sont rangés dans des
+    tableaux; step(dt) reproduit Enemy.update / MovingPlatform.update pour
+    toutes les entités à la fois. Les sprites ne sont recopiés (x, y, rect)
+    que par sync(zone), pour les entités qui touchent la zone (l'écran):
+    hors de la zone, rect n'est plus à jour.
+
+    Seules les MovingPlatform à chemin de 2 points sont prises en charge; les
+    autres restent dans self.fallback et doivent être mises à jour une par une.
+
+      batch = EntityBatch(enemies, moving_platforms)
+      batch.step(dt)
+      batch.sync(cam.viewport())
+    """
+    def __init__(self, enemies: Iterable = (), platforms: Iterable = ()):
+        if np is None:
+            raise ImportError("EntityBatch nécessite numpy (pip install numpy)")
+        self.enemies = list(enemies)
+        self.platforms = []
+        self.fallback = []
+        for p in platforms:
+            (self.platforms if len(p.path) == 2 else self.fallback).append(p)
+
+        en = self.enemies
+        self.ex = np.array([e.x for e in en], dtype=float)
+        self.ey = np.array([e.y for e in en], dtype=float)
+        self.evx = np.array([e.vx for e in en], dtype=float)
+        self.espeed = np.array([abs(e.speed) for e in en], dtype=float)
+        self.elo = np.array([e.patrol_min for e in en], dtype=float)
+        self.ehi = np.array([e.patrol_max for e in en], dtype=float)
+        self.esize = np.array([e.rect.size for e in en], dtype=float).reshape(-1, 2)
+
+        pl = self.platforms
+        self.ppos = np.array([(p.x, p.y) for p in pl], dtype=float).reshape(-1, 2)
+        self.pa = np.array([p.path[0] for p in pl], dtype=float).reshape(-1, 2)
+        self.pb = np.array([p.path[1] for p in pl], dtype=float).reshape(-1, 2)
+        self.ptarget = np.array([p._target for p in pl], dtype=int)
+        self.pspeed = np.array([p.speed for p in pl], dtype=float)
+        self.psize = np.array([p.rect.size for p in pl], dtype=float).reshape(-1, 2)
+
+        self._esynced = np.zeros(len(en), dtype=bool)
+        self._psynced = np.zeros(len(pl), dtype=bool)
+
+    def __len__(self):
+        return len(self.enemies) + len(self.platforms)
+
+    def step(self, dt: float):
+        if len(self.enemies):
+            x = self.ex + self.evx * dt
+            under = x < self.elo
+            over = x > self.ehi
+            self.ex = np.where(under, self.elo, np.where(over, self.ehi, x))
+            self.evx = np.where(under, self.espeed, np.where(over, -self.espeed, self.evx))
+        if len(self.platforms):
+            target = np.where((self.ptarget == 1)[:, None], self.pb, self.pa)
+            d = target - self.ppos
+            dist = np.hypot(d[:, 0], d[:, 1])
+            step = self.pspeed * dt
+            arrive = step >= dist
+            scale = np.divide(step, dist, out=np.zeros_like(dist), where=~arrive)
+            self.ppos = np.where(arrive[:, None], target, self.ppos + d * scale[:, None])
+            self.ptarget = np.where(arrive, 1 - self.ptarget, self.ptarget)
+
+    @staticmethod
+    def _in_view(x, y, size, view: Rect):
+        return ((x + size[:, 0] >= view.left) & (x <= view.right) &
+                (y + size[:, 1] >= view.top) & (y <= view.bottom))
+
+    def sync(self, view: Optional[Rect] = None):
+        """Recopie l'état des entités qui touchent view (toutes si None) dans leurs sprites."""
+        if len(self.enemies):
+            if view is None:
+                mask = np.ones(len(self.enemies), dtype=bool)
+            else:
+                mask = self._in_view(self.ex, self.ey, self.esize, view)
+            for i in np.flatnonzero(mask):
+                e = self.enemies[i]
+                prev = (e.x, e.y)
+                e.x = float(self.ex[i])
+                e.vx = float(self.evx[i])
+                # revient à l'écran: pas d'interpolation depuis une position périmée
+                e.prev_pos = prev if self._esynced[i] else (e.x, e.y)
+                e.sync_rect()
+            self._esynced = mask
+        if len(self.platforms):
+            if view is None:
+                mask = np.ones(len(self.platforms), dtype=bool)
+            else:
+                mask = self._in_view(self.ppos[:, 0], self.ppos[:, 1], self.psize, view)
+            for i in np.flatnonzero(mask):
+                p = self.platforms[i]
+                prev = (p.x, p.y)
+                p.x = float(self.ppos[i, 0])
+                p.y = float(self.ppos[i, 1])
+                p._target = int(self.ptarget[i])
+                p.prev_pos = prev if self._psynced[i] else (p.x, p.y)
+                p.sync_rect()
+            self._psynced = mask
+
+# ---- Monde: simulation sans affichage -----------------------------------
+class InputFrame(NamedTuple):
+    """État des contrôles pour un pas de simulation (arguments de Player.apply_input)."""
+    left: bool = False
+    right: bool = False
+    jump_pressed: bool = False
+    jump_held: bool = False
+
+IDLE = InputFrame()
+
+class World:
+    """Un niveau complet et son pas de physique, utilisable sans fenêtre.
+
+    World ne dessine rien et n'a pas besoin de pygame.display: il suffit que les
+    sprites aient une image (load_image ne fait convert_alpha() que si une
+    fenêtre existe). step() enchaîne: input du joueur, update() des objets,
+    collisions, pièces, ennemis.
+
+      world = World(player, platforms=[...], coins=[...], enemies=[...])
+      world.step(InputFrame(right=True))                  # un pas de step_dt
+      world.run([InputFrame(right=True)] * 600)           # entrées scriptées
+      world.score, world.deaths, world.player.rect
+
+    Pour l'afficher: cam.add(*world.sprites()) puis cam.draw(screen).
+
+    batch=True: Enemy et MovingPlatform sont mis à jour par un EntityBatch
+    (numpy); seuls ceux qui touchent view() (view_size autour du joueur)
+    voient leur sprite mis à jour.
+
+    Dans une boucle d'affichage, advance() découple la physique (pas fixe
+    step_dt) du rythme des frames et retourne le facteur d'interpolation
+    à passer à CameraGroup.draw:
+
+      alpha = world.advance(clock.tick(FPS) / 1000, inputs)
+      cam.draw(screen, alpha=alpha)
+
+    active_radius: seuls les objets à moins de active_radius pixels de view()
+    sont mis à jour; les autres dorment. Une requête spatiale à chaque pas
+    réveille ceux dont le joueur s'approche, et catch_up=True leur fait
+    rattraper le temps passé endormi (GameObject.catch_up). Le coût d'un pas
+    dépend alors de la zone autour de l'écran, plus du nombre total d'objets.
+
+    swept=True: collisions continues pour le joueur (Player.swept), correctes
+    même avec un step_dt plus grand, ex: World(..., step_dt=1 / 30, swept=True).
+
+    goal: zone d'arrivée; finished_at vaut le temps simulé où le joueur l'a
+    touchée pour la première fois (None sinon).
+
+    Les niveaux décrits dans un fichier se chargent avec Level (voir plus bas).
+    """
+    def __init__(self, player: 'Player', platforms: Iterable = (), coins: Iterable = (),
+                 enemies: Iterable = (), others: Iterable = (), spawn: Optional[Tuple[int, int]] = None,
+                 step_dt: float = 1 / PHYSICS_HZ, max_steps: int = 8, batch: bool = False,
+                 view_size: Tuple[int, int] = (800, 600), goal: Optional[Rect] = None,
+                 swept: bool = False, active_radius: Optional[int] = None, catch_up: bool = True):
+        self.player = player
+        if swept:
+            player.swept = True
+        self.platforms = SpatialGroup(*platforms)
+        self.coins = SpatialGroup(*coins)
+        self.enemies = SpatialGroup(*enemies)
+        self.others = list(others)  # décor etc.: mis à jour et dessiné, sans collision
+        self.spawn = spawn if spawn is not None else (player.x, player.y)
+        self.score = 0
+        self.deaths = 0
+        self.coins_collected = 0
+        self.steps = 0
+        self.time = 0.0
+        self.goal = Rect(goal) if goal is not None else None
+        self.finished_at = None  # temps (s) où le joueur a touché goal pour la première fois
+        self.step_dt = step_dt
+        self.max_steps = max_steps  # pas max par advance(): évite la spirale de rattrapage
+        self._accumulator = 0.0
+        self._info = {'platforms': self.platforms}
+        self.view_size = view_size
+        self.display_groups = []  # groupes (CameraGroup...) qui suivent add()/remove()
+        self.streamer = None      # LevelStreamer éventuel, mis à jour à chaque pas
+        # Objets à mettre à jour à chaque pas: tout sauf le décor statique
+        # (dict: ordre conservé, retrait en O(1))
+        self.actors = {obj: None for obj in self.sprites()[1:] if not getattr(obj, 'static', False)}
+        self.batch = None
+        if batch:
+            # Enemy et MovingPlatform passent par EntityBatch (numpy), le reste un par un.
+            # Les objets ajoutés plus tard par add() sont mis à jour un par un.
+            self.batch = EntityBatch([a for a in self.actors if isinstance(a, Enemy)],
+                                     [a for a in self.actors if isinstance(a, MovingPlatform)])
+            for a in self.batch.enemies + self.batch.platforms:
+                del self.actors[a]
+        # Régions d'activité: index spatial des acteurs, réveillés autour de view()
+        self.active_radius = active_radius
+        self.catch_up = catch_up
+        self._active = None
+        self._awake = {}   # acteurs mis à jour ce pas (dict: ordre stable)
+        self._asleep = {}  # acteur endormi -> temps (s) où il s'est endormi
+        if active_radius is not None:
+            # Grandes cellules: la zone interrogée fait au moins la taille de l'écran
+            self._active = SpatialGroup(*self.actors, cell=TILE * 8)
+            self._asleep = dict.fromkeys(self.actors, 0.0)
+
+    def add(self, *sprites):
+        """Ajoute des objets au monde, rangés selon leur type (Coin, Enemy, Platform, autre)."""
+        for spr in sprites:
+            if isinstance(spr, Coin):
+                self.coins.add(spr)
+            elif isinstance(spr, Enemy):
+                self.enemies.add(spr)
+            elif isinstance(spr, Platform):
+                self.platforms.add(spr)
+            else:
+                self.others.append(spr)
+            if not getattr(spr, 'static', False):
+                self.actors[spr] = None
+                if self._active is not None:
+                    self._active.add(spr)
+                    self._asleep[spr] = self.time
+            for group in self.display_groups:
+                group.add(spr)
+
+    def remove(self, *sprites):
+        """Retire des objets du monde et de tous leurs groupes."""
+        for spr in sprites:
+            spr.kill()
+            self.actors.pop(spr, None)
+            self._awake.pop(spr, None)
+            self._asleep.pop(spr, None)
+            if spr in self.others:
+                self.others.remove(spr)
+
+    def attach(self, group: pygame.sprite.AbstractGroup):
+        """Ajoute tous les sprites à group (ex: CameraGroup) et l'y tient à jour ensuite."""
+        group.add(*self.sprites())
+        self.display_groups.append(group)
+
+    def view(self) -> Rect:
+        """Zone de view_size pixels centrée sur le joueur (≈ l'écran)."""
+        r = Rect((0, 0), self.view_size)
+        r.center = self.player.rect.center
+        return r
+
+    def sprites(self) -> list:
+        """Tous les sprites du niveau, joueur en premier (ordre d'ajout conseillé pour CameraGroup)."""
+        return [self.player, *self.platforms, *self.coins, *self.enemies, *self.others]
+
+    def _wake(self) -> dict:
+        """Acteurs à moins de active_radius de view(): réveille (et fait rattraper)
+        les nouveaux venus, endort ceux qui sont sortis de la zone."""
+        r = self.active_radius
+        awake = dict.fromkeys(self._active.query(self.view().inflate(2 * r, 2 * r)))
+        old = self._awake
+        asleep = self._asleep
+        now = self.time
+        for obj in awake:
+            if obj not in old:
+                since = asleep.pop(obj, now)
+                if self.catch_up and now > since:
+                    obj.catch_up(now - since)
+                obj.prev_pos = (obj.x, obj.y)
+        for obj in old:
+            if obj not in awake:
+                asleep[obj] = now
+        self._awake = awake
+        return awake
+
+    def respawn(self):
+        p = self.player
+        p.vx = p.vy = 0
+        p.place(*self.spawn)  # téléportation: pas d'interpolation depuis l'ancienne position
+
+    def step(self, inputs: InputFrame = IDLE, dt: Optional[float] = None):
+        """Avance le monde d'un pas de dt secondes (step_dt par défaut)."""
+        if dt is None:
+            dt = self.step_dt
+        player = self.player
+        player.prev_pos = (player.x, player.y)
+        actors = self.actors if self._active is None else self._wake()
+        for obj in actors:
+            obj.prev_pos = (obj.x, obj.y)
+        prof = PROFILER
+        player.apply_input(inputs[0], inputs[1], inputs[2], inputs[3], dt)
+        if self.streamer is not None:
+            self.streamer.update(player.rect.centerx)
+        if prof is not None:
+            prof.mark('input')
+        info = self._info
+        for obj in actors:
+            if obj.alive():
+                obj.update(dt, world=info)
+        if self.batch is not None:
+            self.batch.step(dt)
+            self.batch.sync(self.view())
+        if prof is not None:
+            prof.mark('update')
+        player.resolve_collisions(self.platforms)
+        if prof is not None:
+            prof.mark('collisions')
+
+        for coin in self.coins.collide(player, dokill=True):
+            self.score += coin.value
+            self.coins_collected += 1
+
+        if self.enemies.collideany(player):
+            self.deaths += 1
+            self.respawn()
+        if prof is not None:
+            prof.mark('pickups')
+            prof.count('steps')
+
+        self.steps += 1
+        self.time += dt
+        if self.finished_at is None and self.goal is not None and player.rect.colliderect(self.goal):
+            self.finished_at = self.time
+
+    def run(self, inputs: Iterable[InputFrame], dt: Optional[float] = None) -> 'World':
+        """Joue une séquence d'entrées (un InputFrame par pas)."""
+        step = self.step
+        for frame in inputs:
+            step(frame, dt)
+        return self
+
+    def advance(self, frame_dt: float, inputs: InputFrame = IDLE) -> float:
+        """Accumule frame_dt et exécute autant de pas fixes step_dt que nécessaire.
+        Retourne alpha (0..1): fraction de pas restante, pour interpoler le rendu.
+        """
+        step_dt = self.step_dt
+        acc = self._accumulator + min(frame_dt, step_dt * self.max_steps)
+        while acc >= step_dt:
+            self.step(inputs, step_dt)
+            acc -= step_dt
+        self._accumulator = acc
+        return acc / step_dt
+
+# ---- Niveaux décrits dans un fichier -------------------------------------
+class Level:
+    """Niveau décrit par des données: une grille de tiles + une liste d'entités.
+
+    Format (JSON, voir levels/demo.json):
+      {
+        "tile": 32,                      # taille d'une case en pixels
+        "origin": [0, -8],               # case (x, y) du premier caractère de "grid"
+        "legend": {"#": {"texture": "ground.png"}, "=": {"color": [120, 90, 60], "type": "oneway"}},
+        "grid": ["....?...", "########"], # une chaîne par ligne, '.' ou ' ' = vide
+        "spawn": [100, -64],             # position du joueur, en pixels
+        "goal": [2000, -448, 112, 448],  # zone d'arrivée (x, y, w, h), optionnelle
+        "player": {"texture": "mario.png"},
+        "entities": [                    # positions et tailles en pixels
+          {"type": "platform", "x": 896, "y": -64, "w": 64, "h": 64, "texture": "pipe.png"},
+          {"type": "oneway", "x": 500, "y": 350, "w": 200, "h": 20},
+          {"type": "moving", "x": 0, "y": 0, "w": 64, "h": 16, "path": [[0, 0], [100, 0]], "speed": 100},
+          {"type": "coin", "x": 250, "y": 0, "texture": "coin.png", "size": [32, 32], "value": 1},
+          {"type": "enemy", "x": 704, "y": -32, "w": 32, "h": 32, "patrol": [704, 0], "speed": 60, "texture": "goomba.png"}
+        ]
+      }
+
+    Les cases identiques et voisines de la grille sont fusionnées en rectangles
+    (une seule Platform par suite de cases), coupés aux bords des sections de
+    section_tiles colonnes pour permettre le chargement par morceaux.
+
+      level = Level.load(os.path.join(LEVEL_DIR, "demo.json"))
+      world = level.make_world(assets)                 # tout le niveau
+      world = level.make_world(assets, stream=True)    # sections autour du joueur
+    """
+    def __init__(self, data: dict, section_tiles: int = 32):
+        self.tile = data.get("tile", TILE)
+        self.origin = tuple(data.get("origin", (0, 0)))
+        self.legend = data.get("legend", {})
+        self.grid = data.get("grid", [])
+        self.entities = data.get("entities", [])
+        self.spawn = tuple(data.get("spawn", (0, 0)))
+        self.goal = tuple(data["goal"]) if "goal" in data else None
+        self.player_info = data.get("player", {})
+        self.section_tiles = section_tiles
+        self.section_px = section_tiles * self.tile
+        self._rects = {}  # section -> rectangles de tiles fusionnés (calculés une fois)
+        # Entités rangées par section, selon leur bord gauche
+        self._section_entities = {}
+        for i, ent in enumerate(self.entities):
+            self._section_entities.setdefault(int(ent["x"] // self.section_px), []).append(i)
+        width = max((len(row) for row in self.grid), default=0)
+        first = self.origin[0] * self.tile // self.section_px
+        last = ((self.origin[0] + width) * self.tile - 1) // self.section_px
+        keys = list(self._section_entities) + ([first, last] if width else [])
+        self.sections = range(min(keys), max(keys) + 1) if keys else range(0)
+
+    @classmethod
+    def load(cls, path: str, section_tiles: int = 32) -> 'Level':
+        import json
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), section_tiles)
+
+    def section_of(self, x: float) -> int:
+        return int(x // self.section_px)
+
+    def tile_rects(self, section: int) -> list:
+        """Rectangles (char, col, row, w, h) de la section, en cases de la grille."""
+        rects = self._rects.get(section)
+        if rects is not None:
+            return rects
+        ox = self.origin[0]
+        lo = section * self.section_tiles - ox
+        hi = lo + self.section_tiles
+        rects = []
+        open_rects = {}  # (col, w, char) -> rectangle en cours d'extension vers le bas
+        for row, line in enumerate(self.grid):
+            runs = []
+            col = max(lo, 0)
+            end = min(hi, len(line))
+            while col < end:
+                ch = line[col]
+                start = col
+                while col < end and line[col] == ch:
+                    col += 1
+                if ch not in ". " and ch in self.legend:
+                    runs.append((start, col - start, ch))
+            still_open = {}
+            for key in runs:
+                r = open_rects.get(key)
+                if r is not None and r[2] + r[4] == row:
+                    r[4] += 1   # même suite que la ligne du dessus: on l'étire
+                else:
+                    r = [key[2], key[0], row, key[1], 1]
+                    rects.append(r)
+                still_open[key] = r
+            open_rects = still_open
+        rects = [tuple(r) for r in rects]
+        self._rects[section] = rects
+        return rects
+
+    def _image(self, info: dict, size: Tuple[int, int], assets: Optional[AssetCache], tiled: bool = False):
+        texture = info.get("texture")
+        if texture is None or assets is None:
+            return None
+        if tiled:
+            return assets.tile(texture, size[0], size[1], size=(self.tile, self.tile))
+        return assets.image(texture, size)
+
+    def build_entity(self, ent: dict, assets: Optional[AssetCache] = None):
+        kind = ent["type"]
+        x, y = ent["x"], ent["y"]
+        color = tuple(ent["color"]) if "color" in ent else None
+        extra = {"color": color} if color else {}
+        if kind == "coin":
+            size = tuple(ent.get("size", (TILE // 2, TILE // 2)))
+            return Coin(x, y, ent.get("value", 1), image=self._image(ent, size, assets))
+        w, h = ent["w"], ent["h"]
+        image = self._image(ent, (w, h), assets)
+        if kind == "platform":
+            return Platform(x, y, w, h, image=image, **extra)
+        if kind == "oneway":
+            return OneWayPlatform(x, y, w, h, image=image, **extra)
+        if kind == "moving":
+            return MovingPlatform(x, y, w, h, path=[tuple(p) for p in ent["path"]],
+                                  speed=ent.get("speed", 100.0), image=image, **extra)
+        if kind == "enemy":
+            return Enemy(x, y, w, h, patrol=tuple(ent["patrol"]), speed=ent.get("speed", 60.0), image=image, **extra)
+        raise ValueError(f"type d'entité inconnu: {kind!r}")
+
+    def build_section(self, section: int, assets: Optional[AssetCache] = None, skip=()) -> list:
+        """Sprites (id d'entité ou None, sprite) de la section; skip: ids d'entités à ne pas créer."""
+        t = self.tile
+        ox, oy = self.origin
+        out = []
+        for ch, col, row, w, h in self.tile_rects(section):
+            info = self.legend[ch]
+            x, y, pw, ph = (ox + col) * t, (oy + row) * t, w * t, h * t
+            image = self._image(info, (pw, ph), assets, tiled=True)
+            color = tuple(info["color"]) if "color" in info else (100, 100, 100)
+            cls = OneWayPlatform if info.get("type") == "oneway" else Platform
+            out.append((None, cls(x, y, pw, ph, color=color, image=image)))
+        for i in self._section_entities.get(section, ()):
+            if i not in skip:
+                out.append((i, self.build_entity(self.entities[i], assets)))
+        return out
+
+    def make_player(self, assets: Optional[AssetCache] = None) -> 'Player':
+        info = self.player_info
+        w, h = info.get("size", (TILE, TILE * 2))
+        return Player(*self.spawn, w, h, image=self._image(info, (w, h), assets))
+
+    def make_world(self, assets: Optional[AssetCache] = None, stream: bool = False,
+                   radius: int = 1024, **world_kwargs) -> World:
+        """Construit un World. stream=True: seules les sections à moins de radius
+        pixels du joueur existent (voir LevelStreamer)."""
+        world_kwargs.setdefault("goal", self.goal)
+        world = World(self.make_player(assets), spawn=self.spawn, **world_kwargs)
+        if stream:
+            world.streamer = LevelStreamer(self, world, assets, radius)
+            world.streamer.update(world.player.rect.centerx)
+        else:
+            for section in self.sections:
+                world.add(*(spr for _, spr in self.build_section(section, assets)))
+        return world
+
+class LevelStreamer:
+    """Charge et décharge les sections d'un Level autour d'une position x.
+
+    Les sections à moins de radius pixels sont construites et ajoutées au World
+    (et à ses display_groups); les autres sont retirées. Les pièces ramassées
+    ne réapparaissent pas; les ennemis reprennent leur position de départ
+    quand leur section est rechargée.
+    """
+    def __init__(self, level: Level, world: World, assets: Optional[AssetCache] = None, radius: int = 1024):
+        self.level = level
+        self.world = world
+        self.assets = assets
+        self.radius = radius
+        self.loaded = {}        # section -> [(id d'entité, sprite)]
+        self.collected = set()  # ids des pièces déjà ramassées
+        self._span = None
+
+    def update(self, x: float):
+        level = self.level
+        lo = max(level.section_of(x - self.radius), level.sections.start)
+        hi = min(level.section_of(x + self.radius), level.sections.stop - 1)
+        if (lo, hi) == self._span:
+            return
+        self._span = (lo, hi)
+        for section in [s for s in self.loaded if not lo <= s <= hi]:
+            self.unload(section)
+        for section in range(lo, hi + 1):
+            if section not in self.loaded:
+                self.load(section)
+
+    def load(self, section: int):
+        items = self.level.build_section(section, self.assets, skip=self.collected)
+        self.loaded[section] = items
+        self.world.add(*(spr for _, spr in items))
+
+    def unload(self, section: int):
+        items = self.loaded.pop(section)
+        for ent_id, spr in items:
+            if ent_id is not None and isinstance(spr, Coin) and not spr.alive():
+                self.collected.add(ent_id)
+        self.world.remove(*(spr for _, spr in items))
+
+# ---- Helpers pour niveaux (Factories) -----------------------------------
+
+def make_ground_segment(x: int, y: int, length_tiles: int) -> Platform:
+    """Crée une plateforme continue de length_tiles * TILE"""
+    return Platform(x, y, length_tiles * TILE, TILE)
+
+# ---- Fin du module: AUCUN main loop n'est exécuté ------------------------
+
+# Vous pouvez utiliser ces classes depuis un autre script. Exemple (non exécuté ici):
+#
+# from platformer import Player, Platform, Coin, MovingPlatform, CameraGroup, SpatialGroup
+# import pygame
+#
+# screen = pygame.display.set_mode((800, 600))
+# player = Player(100, 100)
+# ground = Platform(0, 500, 2000, 32)
+# coin = Coin(200, 450)
+# all_sprites = pygame.sprite.Group(player, ground, coin)
+# platforms = SpatialGroup(ground)
+# cam = CameraGroup(800, 600)
+# cam.add(all_sprites)
+#
+# # Dans la boucle principale, appelez player.apply_input(...) puis player.resolve_collisions(platforms)
+# # puis cam.set_center(player.rect.centerx, player.rect.centery) et cam.draw(screen)
+
 # Fin du fichier
\ No newline at end of file
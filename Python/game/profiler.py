@@ -0,0 +1,205 @@
+"""
+profiler.py
+
+Instrumentation légère pour la boucle de jeu de platformer.py:
+  - temps par phase (input, update, collisions, dessin, flip...)
+  - compteurs (sprites dessinés, tests de collision, blits...)
+  - fenêtre glissante des temps de frame avec p50 / p95 / p99 et histogramme
+  - overlay à l'écran (optionnel) et export CSV / JSON pour analyse hors-ligne
+
+Utilisation:
+  import platformer
+  from profiler import Profiler
+
+  prof = Profiler()
+  platformer.PROFILER = prof      # active les compteurs internes de platformer
+
+  while running:
+      prof.begin_frame()
+      ...                          # gestion des événements
+      prof.mark('events')          # temps écoulé depuis le mark précédent -> 'events'
+      world.advance(dt, inputs)    # World.step marque lui-même input/update/collisions/pickups
+      cam.draw(screen)
+      prof.mark('draw')
+      prof.end_frame()
+
+  prof.dump_json('profile.json')
+
+Quand platformer.PROFILER vaut None (défaut), les points d'instrumentation de
+platformer se réduisent à un test `is not None`.
+"""
+
+import csv
+import json
+import time
+from collections import deque
+from typing import Optional
+
+
+class Profiler:
+    """Chronomètre par phases + compteurs, frame par frame.
+
+    window: nombre de frames gardées pour les percentiles / l'histogramme.
+    max_records: nombre max de frames gardées pour dump_csv / dump_json.
+    """
+    def __init__(self, window: int = 600, max_records: int = 100_000):
+        self.window = deque(maxlen=window)   # temps de frame (s), fenêtre glissante
+        self.records = deque(maxlen=max_records)
+        self.frame = 0
+        self.phases = {}     # phase -> secondes dans la frame courante
+        self.counters = {}   # compteur -> valeur dans la frame courante
+        self._frame_start = 0.0
+        self._last = 0.0
+
+    # -- Mesures --
+    def begin_frame(self):
+        now = time.perf_counter()
+        self._frame_start = now
+        self._last = now
+        self.phases = {}
+        self.counters = {}
+
+    def mark(self, phase: str):
+        """Attribue à phase le temps écoulé depuis le mark (ou begin_frame) précédent."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def end_frame(self):
+        total = time.perf_counter() - self._frame_start
+        self.window.append(total)
+        self.records.append((self.frame, total, self.phases, self.counters))
+        self.frame += 1
+
+    # -- Statistiques --
+    def percentiles(self, ps=(50, 95, 99)) -> dict:
+        """Percentiles des temps de frame de la fenêtre, en millisecondes."""
+        if not self.window:
+            return {f"p{p}": 0.0 for p in ps}
+        data = sorted(self.window)
+        last = len(data) - 1
+        return {f"p{p}": data[min(last, int(round(p / 100 * last)))] * 1000 for p in ps}
+
+    def histogram(self, bucket_ms: float = 1.0) -> dict:
+        """Nombre de frames de la fenêtre par tranche de bucket_ms (clé: borne basse en ms)."""
+        hist = {}
+        for t in self.window:
+            b = int(t * 1000 // bucket_ms) * bucket_ms
+            hist[b] = hist.get(b, 0) + 1
+        return dict(sorted(hist.items()))
+
+    def last_frame(self) -> Optional[tuple]:
+        return self.records[-1] if self.records else None
+
+    def summary(self) -> dict:
+        """Moyennes par phase / compteur sur les frames enregistrées + percentiles."""
+        n = len(self.records) or 1
+        phases = {}
+        counters = {}
+        for _, _, ph, co in self.records:
+            for k, v in ph.items():
+                phases[k] = phases.get(k, 0.0) + v
+            for k, v in co.items():
+                counters[k] = counters.get(k, 0) + v
+        return {
+            "frames": len(self.records),
+            "frame_ms": self.percentiles(),
+            "phase_ms": {k: v / n * 1000 for k, v in phases.items()},
+            "counters_per_frame": {k: v / n for k, v in counters.items()},
+            "histogram_ms": self.histogram(),
+        }
+
+    # -- Export --
+    def _columns(self):
+        phases = {}
+        counters = {}
+        for _, _, ph, co in self.records:
+            phases.update(dict.fromkeys(ph))
+            counters.update(dict.fromkeys(co))
+        return list(phases), list(counters)
+
+    def dump_csv(self, path: str):
+        """Une ligne par frame: frame, total_ms, <phase>_ms..., <compteur>..."""
+        phases, counters = self._columns()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + [f"{p}_ms" for p in phases] + counters)
+            for frame, total, ph, co in self.records:
+                writer.writerow([frame, f"{total * 1000:.4f}"]
+                                + [f"{ph.get(p, 0.0) * 1000:.4f}" for p in phases]
+                                + [co.get(c, 0) for c in counters])
+
+    def dump_json(self, path: str):
+        """Résumé + détail frame par frame."""
+        data = self.summary()
+        data["records"] = [
+            {"frame": frame, "total_ms": total * 1000,
+             "phase_ms": {k: v * 1000 for k, v in ph.items()}, "counters": co}
+            for frame, total, ph, co in self.records
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+
+    # -- Overlay --
+    def overlay_lines(self) -> list:
+        last = self.last_frame()
+        pc = self.percentiles()
+        lines = [f"frame p50 {pc['p50']:.2f} ms  p95 {pc['p95']:.2f}  p99 {pc['p99']:.2f}"]
+        if last is not None:
+            _, total, ph, co = last
+            lines.append(f"last {total * 1000:.2f} ms")
+            lines += [f"  {k}: {v * 1000:.2f} ms" for k, v in ph.items()]
+            lines += [f"  {k}: {v}" for k, v in co.items()]
+        return lines
+
+
+class ProfilerOverlay:
+    """Affiche les statistiques d'un Profiler en haut à droite de l'écran.
+
+    Le texte n'est re-rendu que toutes les `every` frames pour ne pas fausser
+    les mesures.
+    """
+    def __init__(self, profiler: Profiler, every: int = 15, size: int = 18):
+        self.profiler = profiler
+        self.every = every
+        self.size = size
+        self.visible = True
+        self._font = None
+        self._surface = None
+        self._age = every
+
+    def _render(self):
+        import pygame
+        if self._font is None:
+            self._font = pygame.font.Font(None, self.size)
+        font = self._font
+        lines = [font.render(line, True, (255, 255, 255)) for line in self.profiler.overlay_lines()]
+        w = max((s.get_width() for s in lines), default=0) + 8
+        h = sum(s.get_height() for s in lines) + 8
+        surf = pygame.Surface((w, h), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 160))
+        y = 4
+        for s in lines:
+            surf.blit(s, (4, y))
+            y += s.get_height()
+        return surf
+
+    def rect(self, surface):
+        """Zone occupée sur surface (None si caché); re-rend le texte s'il est périmé."""
+        if not self.visible:
+            return None
+        if self._surface is None or self._age >= self.every:
+            self._surface = self._render()
+            self._age = 0
+        return self._surface.get_rect(topright=(surface.get_width() - 10, 10))
+
+    def draw(self, surface):
+        rect = self.rect(surface)
+        if rect is None:
+            return None
+        self._age += 1
+        surface.blit(self._surface, rect)
+        return rect
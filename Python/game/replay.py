@@ -0,0 +1,305 @@
+"""
+replay.py
+
+Enregistrement des entrées d'une partie et rejeu sans fenêtre, bien plus vite
+que le temps réel.
+
+Une partie est entièrement décrite par la suite, frame par frame, des
+arguments de Player.apply_input (left, right, jump_pressed, jump_held) et du
+dt passé à World.advance. Le fichier contient aussi des points de contrôle
+(rect du joueur, score, morts, pièces ramassées) pour vérifier que le rejeu
+retrouve le même état: tests de non-régression, ou reproduire un bug signalé
+sans rejouer le niveau à la main.
+
+Enregistrer (dans la boucle de jeu, à la place de world.advance):
+  rec = Recorder("demo.json", world)
+  alpha = rec.advance(dt, inputs)
+  ...
+  rec.save("partie.rpl")
+
+Rejouer:
+  python replay.py partie.rpl                 # vérifie les points de contrôle
+  python replay.py partie.rpl --repeat 20     # mesure la vitesse de rejeu
+  python replay.py partie.rpl --until 1800 --trace
+      -> s'arrête à la frame 1800 en affichant l'état à chaque point de contrôle
+
+Format (little-endian):
+  en-tête   b"PFRP", version u8, step_dt f64, max_steps u8, stream u8,
+            longueur u16 + chemin du niveau (utf-8)
+  puis une suite d'enregistrements, selon le premier octet:
+    0..15   entrées: bits left|right<<1|jump_pressed<<2|jump_held<<3,
+            suivi de dt u32 (µs) et count u16: count frames identiques
+    0x80    point de contrôle: frame u32, rect x, y, w, h i32, score i32,
+            deaths i32, pièces u32 (état APRÈS la frame)
+    0xFF    fin
+Une minute à 60 FPS en tenant la même touche tient donc en quelques octets.
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+from typing import NamedTuple, Optional
+
+import pygame
+
+from platformer import AssetCache, InputFrame, Level, World, LEVEL_DIR
+
+MAGIC = b"PFRP"
+VERSION = 1
+_HEADER = struct.Struct("<4sBdBBH")
+_RUN = struct.Struct("<BIH")
+_CHECK = struct.Struct("<BIiiiiiiI")
+_CHECK_TAG = 0x80
+_END_TAG = 0xFF
+
+
+class Checkpoint(NamedTuple):
+    frame: int
+    rect: tuple
+    score: int
+    deaths: int
+    coins: int
+
+    @classmethod
+    def of(cls, frame: int, world: World) -> 'Checkpoint':
+        return cls(frame, tuple(world.player.rect), world.score, world.deaths, world.coins_collected)
+
+
+def _pack_inputs(inputs) -> int:
+    return bool(inputs[0]) | bool(inputs[1]) << 1 | bool(inputs[2]) << 2 | bool(inputs[3]) << 3
+
+
+def _unpack_inputs(bits: int) -> InputFrame:
+    return InputFrame(bool(bits & 1), bool(bits & 2), bool(bits & 4), bool(bits & 8))
+
+
+class Recording:
+    """Une partie enregistrée: niveau, réglages du World, entrées et points de contrôle.
+
+    frames: liste de (bits d'entrée, dt en microsecondes), une par frame.
+    """
+    def __init__(self, level: str, step_dt: float, max_steps: int, stream: bool = False):
+        self.level = level
+        self.step_dt = step_dt
+        self.max_steps = max_steps
+        self.stream = stream
+        self.frames = []
+        self.checkpoints = []
+
+    def __len__(self):
+        return len(self.frames)
+
+    def inputs(self, until: Optional[int] = None):
+        """(InputFrame, dt en secondes) pour chaque frame, jusqu'à until incluse."""
+        frames = self.frames if until is None else self.frames[:until + 1]
+        cache = {}
+        for bits, dt_us in frames:
+            inputs = cache.get(bits)
+            if inputs is None:
+                inputs = cache[bits] = _unpack_inputs(bits)
+            yield inputs, dt_us / 1_000_000
+
+    def level_path(self) -> str:
+        """Chemin du niveau; les chemins relatifs sont pris dans LEVEL_DIR."""
+        return self.level if os.path.isabs(self.level) else os.path.join(LEVEL_DIR, self.level)
+
+    def make_world(self, assets: Optional[AssetCache] = None) -> World:
+        """Monde dans l'état initial de l'enregistrement."""
+        level = Level.load(self.level_path())
+        return level.make_world(assets if assets is not None else AssetCache(), stream=self.stream,
+                                step_dt=self.step_dt, max_steps=self.max_steps)
+
+    # -- Fichier --
+    def to_bytes(self) -> bytes:
+        name = self.level.encode("utf-8")
+        out = [_HEADER.pack(MAGIC, VERSION, self.step_dt, self.max_steps, self.stream, len(name)), name]
+        checks = iter(self.checkpoints)
+        check = next(checks, None)
+        frames = self.frames
+        i, n = 0, len(frames)
+        while i < n:
+            # Une suite de frames identiques, coupée aux points de contrôle
+            stop = min(n, i + 0xFFFF)
+            if check is not None:
+                stop = min(stop, check.frame + 1)
+            j = i + 1
+            while j < stop and frames[j] == frames[i]:
+                j += 1
+            out.append(_RUN.pack(frames[i][0], frames[i][1], j - i))
+            i = j
+            while check is not None and check.frame < i:
+                out.append(_CHECK.pack(_CHECK_TAG, check.frame, *check.rect, check.score, check.deaths, check.coins))
+                check = next(checks, None)
+        out.append(bytes((_END_TAG,)))
+        return b"".join(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Recording':
+        try:
+            return cls._parse(data)
+        except struct.error:
+            # Un enregistrement coupé au milieu (fichier incomplet)
+            raise ValueError("enregistrement tronqué") from None
+
+    @classmethod
+    def _parse(cls, data: bytes) -> 'Recording':
+        magic, version, step_dt, max_steps, stream, name_len = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("pas un enregistrement de partie")
+        if version != VERSION:
+            raise ValueError(f"version d'enregistrement non supportée: {version}")
+        pos = _HEADER.size
+        if pos + name_len > len(data):
+            raise ValueError("enregistrement tronqué")
+        rec = cls(data[pos:pos + name_len].decode("utf-8"), step_dt, max_steps, bool(stream))
+        pos += name_len
+        while True:
+            if pos >= len(data):
+                raise ValueError("enregistrement tronqué")
+            tag = data[pos]
+            if tag == _END_TAG:
+                break
+            if tag == _CHECK_TAG:
+                _, frame, x, y, w, h, score, deaths, coins = _CHECK.unpack_from(data, pos)
+                rec.checkpoints.append(Checkpoint(frame, (x, y, w, h), score, deaths, coins))
+                pos += _CHECK.size
+            elif tag < 16:
+                bits, dt_us, count = _RUN.unpack_from(data, pos)
+                rec.frames += [(bits, dt_us)] * count
+                pos += _RUN.size
+            else:
+                raise ValueError(f"enregistrement corrompu (octet {pos}: {tag:#x})")
+        return rec
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Recording':
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class Recorder:
+    """Enregistre les frames d'une partie en cours.
+
+    advance() remplace world.advance(): le dt est arrondi à la microseconde
+    AVANT d'être utilisé, pour que le rejeu refasse exactement les mêmes pas.
+    Un point de contrôle est pris toutes les checkpoint_every frames, et à la fin.
+    """
+    def __init__(self, level: str, world: World, checkpoint_every: int = 60):
+        stream = world.streamer is not None
+        self.recording = Recording(level, world.step_dt, world.max_steps, stream)
+        self.checkpoint_every = checkpoint_every
+        self.world = world
+
+    def advance(self, frame_dt: float, inputs: InputFrame) -> float:
+        world = self.world
+        dt_us = max(0, min(round(frame_dt * 1_000_000), 0xFFFFFFFF))
+        rec = self.recording
+        rec.frames.append((_pack_inputs(inputs), dt_us))
+        alpha = world.advance(dt_us / 1_000_000, inputs)
+        if len(rec.frames) % self.checkpoint_every == 0:
+            rec.checkpoints.append(Checkpoint.of(len(rec.frames) - 1, world))
+        return alpha
+
+    def save(self, path: str):
+        rec = self.recording
+        last = len(rec.frames) - 1
+        if last >= 0 and (not rec.checkpoints or rec.checkpoints[-1].frame != last):
+            rec.checkpoints.append(Checkpoint.of(last, self.world))
+        rec.save(path)
+
+
+class ReplayResult(NamedTuple):
+    world: World
+    frames: int
+    elapsed: float            # secondes de calcul
+    mismatches: list          # [(attendu, obtenu)] pour chaque point de contrôle différent
+
+    @property
+    def speed(self) -> float:
+        """Facteur par rapport au temps réel (temps simulé / temps de calcul)."""
+        return self.world.time / self.elapsed if self.elapsed else float("inf")
+
+
+def replay(rec: Recording, world: Optional[World] = None, until: Optional[int] = None,
+           verify: bool = True, on_checkpoint=None) -> ReplayResult:
+    """Rejoue rec (jusqu'à la frame until incluse) sur world, un monde neuf par défaut.
+
+    on_checkpoint(attendu, obtenu) est appelé à chaque point de contrôle.
+    """
+    if world is None:
+        world = rec.make_world()
+    checks = {c.frame: c for c in rec.checkpoints} if verify or on_checkpoint else {}
+    mismatches = []
+    advance = world.advance
+    i = -1
+    t = time.perf_counter()
+    for i, (inputs, dt) in enumerate(rec.inputs(until)):
+        advance(dt, inputs)
+        expected = checks.get(i)
+        if expected is not None:
+            got = Checkpoint.of(i, world)
+            if verify and got != expected:
+                mismatches.append((expected, got))
+            if on_checkpoint is not None:
+                on_checkpoint(expected, got)
+    return ReplayResult(world, i + 1, time.perf_counter() - t, mismatches)
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"doit être au moins 1: {text}")
+    return value
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rejoue un enregistrement de partie sans fenêtre")
+    parser.add_argument("recording", help="fichier .rpl écrit par Recorder (game.py --record)")
+    parser.add_argument("--repeat", type=_positive_int, default=1, help="nombre de rejeux (mesure de vitesse)")
+    parser.add_argument("--until", type=int, help="s'arrêter après cette frame")
+    parser.add_argument("--no-verify", action="store_true", help="ne pas comparer les points de contrôle")
+    parser.add_argument("--trace", action="store_true", help="affiche l'état à chaque point de contrôle")
+    args = parser.parse_args(argv)
+
+    # Pas de fenêtre (pilote SDL "dummy"); réglé ici pour que game.py puisse importer ce module
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    rec = Recording.load(args.recording)
+    print(f"{args.recording}: {rec.level}, {len(rec)} frames, {len(rec.checkpoints)} points de contrôle")
+
+    def trace(expected, got):
+        mark = "ok" if expected == got else f"ATTENDU {expected}"
+        print(f"  frame {got.frame:>6}: rect={got.rect} score={got.score} "
+              f"deaths={got.deaths} coins={got.coins}  {mark}")
+
+    assets = AssetCache()
+    status = 0
+    total = 0.0
+    for n in range(args.repeat):
+        result = replay(rec, rec.make_world(assets), until=args.until, verify=not args.no_verify,
+                        on_checkpoint=trace if args.trace and n == 0 else None)
+        total += result.elapsed
+        if result.mismatches:
+            status = 1
+            if n == 0:
+                expected, got = result.mismatches[0]
+                print(f"DIVERGENCE à la frame {expected.frame}: attendu {expected}, obtenu {got}",
+                      file=sys.stderr)
+    world = result.world
+    print(f"état final: rect={tuple(world.player.rect)} score={world.score} deaths={world.deaths} "
+          f"coins={world.coins_collected}")
+    speed = world.time * args.repeat / total if total else float("inf")
+    print(f"{args.repeat} rejeu(x) en {total:.3f} s, {speed:.0f}x le temps réel")
+    pygame.quit()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+sweep.py
+
+Balayage de réglages de la physique sur plusieurs cœurs, sans fenêtre.
+
+Chaque combinaison (niveau, script d'entrées, jeu de paramètres) est un
+épisode joué par un World headless dans un processus de travail; on récupère
+le temps pour atteindre l'arrivée ("goal" du niveau), les morts et les pièces.
+Les épisodes sont indépendants: le débit croît avec le nombre de cœurs.
+
+Paramètres réglables (--set nom=v1,v2,...):
+  gravity, terminal_v              constantes GRAVITY / TERMINAL_V de platformer
+  speed, accel, jump_speed         attributs du Player
+
+Scripts d'entrées:
+  right, right_jump, hop           scripts intégrés (un InputFrame par pas de physique)
+  FICHIER.rpl                      partie enregistrée (game.py --record), rejouée frame par frame
+
+Utilisation:
+  python sweep.py --set gravity=5000,6000,7000 --set jump_speed=1100,1200,1300
+  python sweep.py --levels demo.json --scripts right_jump partie.rpl --workers 8 --out sweep.csv
+  python sweep.py --hz 30 --swept --set gravity=5000,6000     # physique 4x moins chère
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional
+
+import pygame
+
+import platformer
+from platformer import AssetCache, InputFrame, Level, World, LEVEL_DIR, PHYSICS_HZ
+from replay import Recording
+
+# nom -> (cible, attribut): constante du module platformer ou attribut du joueur
+PARAMS = {
+    "gravity": ("module", "GRAVITY"),
+    "terminal_v": ("module", "TERMINAL_V"),
+    "speed": ("player", "speed"),
+    "accel": ("player", "accel"),
+    "jump_speed": ("player", "jump_speed"),
+}
+
+
+def _right(i: int, hz: int) -> InputFrame:
+    return InputFrame(right=True)
+
+
+def _right_jump(i: int, hz: int) -> InputFrame:
+    """À droite, saut tenu une demi-seconde toutes les secondes."""
+    t = i % hz
+    return InputFrame(right=True, jump_pressed=t == 0, jump_held=t < hz // 2)
+
+
+def _hop(i: int, hz: int) -> InputFrame:
+    """À droite, petits sauts (touche relâchée tout de suite) toutes les 0,4 s."""
+    t = i % (hz * 2 // 5)
+    return InputFrame(right=True, jump_pressed=t == 0, jump_held=t == 0)
+
+
+SCRIPTS = {"right": _right, "right_jump": _right_jump, "hop": _hop}
+DEFAULT_LEVEL = "demo.json"
+
+
+class Episode(NamedTuple):
+    level: Optional[str]  # None: celui de l'enregistrement, sinon DEFAULT_LEVEL
+    script: str           # nom d'un script intégré ou chemin d'un .rpl
+    params: tuple         # ((nom, valeur), ...)
+    max_time: float       # secondes simulées avant abandon
+    hz: int = PHYSICS_HZ  # fréquence de la physique (scripts intégrés)
+    swept: bool = False   # collisions continues (World(swept=True))
+
+
+# -- Côté processus de travail --
+_assets = None
+_levels = {}
+_recordings = {}
+
+
+def _init_worker():
+    """Initialise pygame sans fenêtre dans le processus (images des sprites)."""
+    global _assets
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    _assets = AssetCache()
+
+
+def _level(name: str) -> Level:
+    level = _levels.get(name)
+    if level is None:
+        path = name if os.path.isabs(name) else os.path.join(LEVEL_DIR, name)
+        level = _levels[name] = Level.load(path)
+    return level
+
+
+def _recording(path: str) -> Recording:
+    rec = _recordings.get(path)
+    if rec is None:
+        rec = _recordings[path] = Recording.load(path)
+    return rec
+
+
+def _play_script(world: World, script, max_time: float):
+    hz = round(1 / world.step_dt)
+    step = world.step
+    for i in range(int(max_time * hz)):
+        step(script(i, hz))
+        if world.finished_at is not None:
+            break
+
+
+def _play_recording(world: World, rec: Recording, max_time: float):
+    advance = world.advance
+    for inputs, dt in rec.inputs():
+        advance(dt, inputs)
+        if world.finished_at is not None or world.time >= max_time:
+            break
+
+
+def run_episode(ep: Episode) -> dict:
+    """Joue un épisode et retourne ses mesures (une ligne du résultat)."""
+    if _assets is None:
+        _init_worker()
+    rec = _recording(ep.script) if ep.script.endswith(".rpl") else None
+    level_name = ep.level or (rec.level if rec is not None else DEFAULT_LEVEL)
+    saved = {attr: getattr(platformer, attr) for target, attr in PARAMS.values() if target == "module"}
+    t = time.perf_counter()
+    try:
+        player_attrs = {}
+        for name, value in ep.params:
+            target, attr = PARAMS[name]
+            if target == "module":
+                setattr(platformer, attr, value)
+            else:
+                player_attrs[attr] = value
+        kwargs = {"step_dt": rec.step_dt, "max_steps": rec.max_steps} if rec is not None else {"step_dt": 1 / ep.hz}
+        world = _level(level_name).make_world(_assets, stream=True, swept=ep.swept, **kwargs)
+        for attr, value in player_attrs.items():
+            setattr(world.player, attr, value)
+        if rec is not None:
+            _play_recording(world, rec, ep.max_time)
+        else:
+            _play_script(world, SCRIPTS[ep.script], ep.max_time)
+    finally:
+        for attr, value in saved.items():
+            setattr(platformer, attr, value)
+    row = {"level": level_name, "script": ep.script}
+    row.update(ep.params)
+    row.update({
+        "completed": world.finished_at is not None,
+        "time": world.finished_at,
+        "deaths": world.deaths,
+        "coins": world.coins_collected,
+        "score": world.score,
+        "sim_time": world.time,
+        "wall_ms": (time.perf_counter() - t) * 1000,
+    })
+    return row
+
+
+# -- Côté processus principal --
+def make_grid(levels, scripts, params: dict, max_time: float, hz: int = PHYSICS_HZ, swept: bool = False) -> list:
+    """Produit cartésien niveaux x scripts x valeurs de chaque paramètre."""
+    names = list(params)
+    combos = [tuple(zip(names, values)) for values in itertools.product(*(params[n] for n in names))]
+    return [Episode(level, script, combo, max_time, hz, swept)
+            for level in levels for script in scripts for combo in combos]
+
+
+def run_sweep(episodes: list, workers: Optional[int] = None) -> list:
+    """Exécute les épisodes (dans l'ordre du résultat) sur workers processus.
+
+    workers=1: dans le processus courant, sans pool (débogage, profilage).
+    """
+    if workers == 1:
+        return [run_episode(ep) for ep in episodes]
+    workers = workers or os.cpu_count() or 1
+    # Des lots de plusieurs épisodes par envoi: moins d'aller-retours entre processus
+    chunksize = max(1, len(episodes) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(run_episode, episodes, chunksize=chunksize))
+
+
+def _parse_set(text: str):
+    name, _, values = text.partition("=")
+    if name not in PARAMS or not values:
+        raise argparse.ArgumentTypeError(f"attendu nom=v1,v2,... avec nom parmi {', '.join(PARAMS)}")
+    return name, [float(v) for v in values.split(",")]
+
+
+def write_results(rows: list, path: str):
+    if path.endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=1)
+        return
+    columns = list(dict.fromkeys(k for row in rows for k in row))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", nargs="*", default=[None],
+                        help=f"niveaux (dans levels/ si relatif); défaut: celui du .rpl, ou {DEFAULT_LEVEL}")
+    parser.add_argument("--scripts", nargs="*", default=["right_jump"], help="scripts intégrés ou fichiers .rpl")
+    parser.add_argument("--set", dest="params", action="append", type=_parse_set, default=[],
+                        metavar="NOM=V1,V2", help="valeurs d'un paramètre (répétable)")
+    parser.add_argument("--max-time", type=float, default=60.0, help="secondes simulées max par épisode")
+    parser.add_argument("--hz", type=int, default=PHYSICS_HZ, help="fréquence de la physique (scripts intégrés)")
+    parser.add_argument("--swept", action="store_true", help="collisions continues (conseillé si --hz est bas)")
+    parser.add_argument("--workers", type=int, default=None, help="processus (défaut: nombre de cœurs)")
+    parser.add_argument("--out", help="écrit les résultats (CSV, ou JSON si .json)")
+    args = parser.parse_args(argv)
+
+    for script in args.scripts:
+        if not script.endswith(".rpl") and script not in SCRIPTS:
+            parser.error(f"script inconnu: {script} (intégrés: {', '.join(SCRIPTS)})")
+    # --set répété pour un même paramètre: les valeurs s'ajoutent (sans doublons)
+    params = {}
+    for name, values in args.params:
+        params[name] = list(dict.fromkeys(params.get(name, []) + values))
+    episodes = make_grid(args.levels, args.scripts, params, args.max_time, args.hz, args.swept)
+
+    t = time.perf_counter()
+    rows = run_sweep(episodes, args.workers)
+    elapsed = time.perf_counter() - t
+
+    names = list(params)
+    for row in rows:
+        params = " ".join(f"{n}={row[n]:g}" for n in names)
+        done = f"{row['time']:7.2f} s" if row["completed"] else "   -     "
+        print(f"{row['level']:>12} {row['script']:>12}  {params}  arrivée {done}  "
+              f"morts {row['deaths']:3d}  pièces {row['coins']:3d}")
+    sim = sum(row["sim_time"] for row in rows)
+    print(f"\n{len(rows)} épisodes en {elapsed:.2f} s ({len(rows) / elapsed:.1f}/s, "
+          f"{sim / elapsed:.0f} s simulées par seconde)")
+    if args.out:
+        write_results(rows, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import math
+import time
+import weakref
+
+# Periodic jobs for Tk apps, all driven by a single `after` timer.
+#
+# Re-arming `widget.after(1000, f)` at the end of f drifts: every period also
+# includes f's own runtime and the timer's lateness, so a clock eventually skips
+# or repeats a displayed second. Here every tick is scheduled at an absolute
+# wall-clock time (the next multiple of the period by default, e.g. exactly on
+# each second), so lateness never accumulates. All the jobs share one timer,
+# armed for the earliest of them: a display that updates once per second wakes
+# up once per second.
+#
+#   ticks = Scheduler(root)
+#   ticks.every(1.0, update_clock)       # update_clock(t), t = time of the tick
+#   ticks.once(0.016, flush)             # flush(), in 16 ms
+#
+# set_text() only pushes a label's text to Tk when it changed.
+
+
+class Job:
+    def __init__(self, callback, interval, due, periodic, offset=0.0):
+        self.callback = callback
+        self.interval = interval  # period, or delay of a one-shot job (seconds)
+        self.due = due  # wall-clock time of the next run
+        self.periodic = periodic
+        self.offset = offset
+        self.active = True
+
+
+def next_boundary(now, period, offset=0.0):
+    """First time after now that is offset + a whole number of periods (epoch based)."""
+    return math.floor((now - offset) / period + 1) * period + offset
+
+
+class Scheduler:
+    def __init__(self, widget, clock=time.time):
+        self.widget = widget
+        self.clock = clock
+        self.jobs = []
+        self.timer = None  # Tk `after` id
+        self.armed_for = None  # due time the timer was armed for
+
+    def every(self, period, callback, align=True, offset=0.0):
+        """Call callback(t) every period seconds, t being the scheduled wall-clock time.
+
+        align: ticks fall on multiples of period (+ offset) since the epoch, e.g.
+        on each second for period=1; otherwise the first tick is period from now.
+        Ticks missed while the app was blocked or asleep are not replayed: the
+        next tick is the next boundary.
+        """
+        now = self.clock()
+        due = next_boundary(now, period, offset) if align else now + period
+        job = Job(callback, period, due, True, offset if align else now % period)
+        self.jobs.append(job)
+        self.arm()
+        return job
+
+    def once(self, delay, callback):
+        """Call callback() once, delay seconds from now."""
+        job = Job(callback, delay, self.clock() + delay, False)
+        self.jobs.append(job)
+        self.arm()
+        return job
+
+    def cancel(self, job):
+        if job.active:
+            job.active = False
+            self.jobs.remove(job)
+            self.arm()
+
+    def arm(self):
+        # One timer, for the earliest job; only re-armed when that changes
+        due = min((job.due for job in self.jobs), default=None)
+        if due == self.armed_for:
+            return
+        if self.timer is not None:
+            self.widget.after_cancel(self.timer)
+            self.timer = None
+        self.armed_for = due
+        if due is not None:
+            delay = max(0, math.ceil((due - self.clock()) * 1000))
+            self.timer = self.widget.after(delay, self.run)
+
+    def run(self):
+        self.timer = None
+        self.armed_for = None
+        now = self.clock()
+        try:
+            for job in sorted(self.jobs, key=lambda job: job.due):
+                if not job.active:
+                    continue  # cancelled by an earlier callback
+                if job.due - now > job.interval:
+                    # The wall clock went back (manual change, NTP step): reschedule from now
+                    job.due = next_boundary(now, job.interval, job.offset) if job.periodic else now + job.interval
+                if job.due > now:
+                    continue  # not due yet (or the timer fired a little early)
+                due = job.due
+                if job.periodic:
+                    job.due = due + job.interval
+                    if job.due <= now:
+                        job.due = next_boundary(now, job.interval, job.offset)  # skip missed ticks
+                    job.callback(due)
+                else:
+                    self.cancel(job)
+                    job.callback()
+        finally:
+            self.arm()
+
+
+# widget -> text it currently shows; weak, so destroyed widgets can still be freed
+TEXTS = weakref.WeakKeyDictionary()
+
+
+def set_text(widget, text):
+    """widget.config(text=text), skipped when the widget already shows text."""
+    if TEXTS.get(widget) != text:
+        widget.config(text=text)
+        TEXTS[widget] = text